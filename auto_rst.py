@@ -8,13 +8,23 @@ then generates RST files with appropriate Sphinx directives for documentation ge
 
 import argparse
 import ast
+import hashlib
+import multiprocessing
 import os
-import pathlib
-from typing import List, Dict, Any
+import pickle
+import shlex
+import sys
+import tempfile
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 from natsort import natsorted
 from sphinx.util.rst import escape
 
+#: Version of the member extraction logic, bump it when the extracted structure changes
+#: so that stale entries in the on-disk cache are ignored.
+_EXTRACTOR_VERSION = 3
+
 
 def rst_to_text(text: str) -> str:
     """
@@ -29,23 +39,142 @@ def rst_to_text(text: str) -> str:
     return escape(text)
 
 
-class PublicMemberExtractor(ast.NodeVisitor):
+_PRIVATE, _PROTECTED, _PUBLIC, _MAGIC = 0, 1, 2, 3
+
+
+def _classify(name: str) -> int:
+    """
+    Classify a member name by its underscore prefix and suffix in a single pass.
+
+    :param name: The member name to classify.
+    :type name: str
+
+    :return: One of ``_PRIVATE`` (``__name``), ``_PROTECTED`` (``_name``), ``_MAGIC`` (``__name__``)
+        and ``_PUBLIC``. Public and magic names are the ones with a value ``>= _PUBLIC``.
+    :rtype: int
+    """
+    if name[:2] == '__':
+        if name[-2:] != '__':
+            return _PRIVATE
+        return _MAGIC if len(name) > 4 else _PUBLIC
+    elif name[:1] == '_':
+        return _PROTECTED
+    else:
+        return _PUBLIC
+
+
+_DEC_CACHE: Dict[tuple, str] = {}
+
+
+def _get_decorator_name(decorator) -> str:
+    """
+    Get the name of a decorator, caching the common simple forms.
+
+    Plain names (``@property``) and attributes of plain names (``@functools.wraps``)
+    repeat a lot across a code base, so their string form is interned and cached in
+    ``_DEC_CACHE`` keyed on the node type and identifiers. Other decorators (e.g.
+    calls like ``@lru_cache()``) cannot be identified by such a cheap key and are
+    unparsed every time.
+
+    :param decorator: The decorator AST node.
+
+    :return: String representation of the decorator name.
+    :rtype: str
+    """
+    node_type = type(decorator)
+    if node_type is ast.Name:
+        key = (node_type, decorator.id)
+    elif node_type is ast.Attribute and type(decorator.value) is ast.Name:
+        key = (node_type, decorator.value.id, decorator.attr)
+    else:
+        return ast.unparse(decorator)
+
+    name = _DEC_CACHE.get(key)
+    if name is None:
+        name = _DEC_CACHE[key] = sys.intern(ast.unparse(decorator))
+    return name
+
+
+def _collect_class_member_names(node: ast.ClassDef) -> List[str]:
+    """
+    Collect the names of the public members and magic methods of a class in one pass.
+
+    This is the cheap form of :meth:`PublicMemberExtractor.extract_class_members` for the
+    ``:members:`` option, nothing but the names is looked at. Methods come first and
+    attributes after them, the same order as the detailed extraction.
+
+    :param node: The class definition AST node.
+    :type node: ast.ClassDef
+
+    :return: Names of the public methods, then of the public class attributes.
+    :rtype: List[str]
+    """
+    method_names, attr_names = [], []
+    for item in node.body:
+        item_type = type(item)
+        if item_type is ast.FunctionDef or item_type is ast.AsyncFunctionDef:
+            if _classify(item.name) >= _PUBLIC:
+                method_names.append(item.name)
+        elif item_type is ast.Assign:
+            for target in item.targets:
+                if type(target) is ast.Name and _classify(target.id) >= _PUBLIC:
+                    attr_names.append(target.id)
+        elif item_type is ast.AnnAssign:
+            if type(item.target) is ast.Name and _classify(item.target.id) >= _PUBLIC:
+                attr_names.append(item.target.id)
+
+    return method_names + attr_names
+
+
+class PublicMemberExtractor:
     """
     Extract public members (classes, functions, variables) from Python code.
 
-    This class uses AST node visiting to traverse Python code and identify
+    This class walks the top-level statements of a module AST and identifies
     public classes, functions, and variables, excluding private and protected members.
+    Nested statements are never visited.
+
+    In docs mode, classes are only extracted as ``{'name': ..., 'member_names': [...]}``,
+    which is all the RST generation needs, without the details of their members.
     """
 
-    def __init__(self):
+    def __init__(self, docs_mode: bool = False):
         """
         Initialize the PublicMemberExtractor.
 
-        Sets up empty lists to store extracted public classes, functions, and variables.
+        Sets up empty lists to store extracted public classes, functions, and variables,
+        and the node-type dispatch table used by :meth:`run`.
+
+        :param docs_mode: Only extract the member names of classes. Defaults to False.
+        :type docs_mode: bool
         """
+        self.docs_mode = docs_mode
         self.public_classes = []
         self.public_functions = []
         self.public_variables = []
+        self._dispatch = {
+            ast.ClassDef: self.visit_ClassDef,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.AsyncFunctionDef: self.visit_FunctionDef,
+            ast.Assign: self.visit_Assign,
+            ast.AnnAssign: self.visit_AnnAssign,
+        }
+
+    def run(self, tree: ast.Module):
+        """
+        Extract public members from the top-level statements of a module.
+
+        Only the direct children of the module body are inspected, nested statements
+        (e.g. the contents of ``if __name__ == '__main__':`` blocks) are not visited.
+
+        :param tree: The parsed module AST.
+        :type tree: ast.Module
+        """
+        dispatch = self._dispatch
+        for node in tree.body:
+            fn = dispatch.get(type(node))
+            if fn is not None:
+                fn(node)
 
     @classmethod
     def is_private(cls, name: str) -> bool:
@@ -58,7 +187,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :return: True if the name is private, False otherwise.
         :rtype: bool
         """
-        return name.startswith('__') and not (name.startswith('__') and name.endswith('__'))
+        return _classify(name) == _PRIVATE
 
     @classmethod
     def is_protected(cls, name: str) -> bool:
@@ -71,7 +200,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :return: True if the name is protected, False otherwise.
         :rtype: bool
         """
-        return name.startswith('_') and not name.startswith('__')
+        return _classify(name) == _PROTECTED
 
     @classmethod
     def is_magic_method(cls, name: str) -> bool:
@@ -84,7 +213,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :return: True if the name is a magic method, False otherwise.
         :rtype: bool
         """
-        return name.startswith('__') and name.endswith('__') and len(name) > 4
+        return _classify(name) == _MAGIC
 
     @classmethod
     def is_public_or_magic(cls, name: str) -> bool:
@@ -97,7 +226,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :return: True if the name is public or a magic method, False otherwise.
         :rtype: bool
         """
-        return not cls.is_private(name) and not cls.is_protected(name) or cls.is_magic_method(name)
+        return _classify(name) >= _PUBLIC
 
     def extract_class_members(self, node: ast.ClassDef) -> Dict[str, Any]:
         """
@@ -113,8 +242,9 @@ class PublicMemberExtractor(ast.NodeVisitor):
         attributes = []
 
         for item in node.body:
-            if isinstance(item, ast.FunctionDef):
-                if self.is_public_or_magic(item.name):
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = _classify(item.name)
+                if kind >= _PUBLIC:
                     method_info = {
                         'name': item.name,
                         'type': 'method',
@@ -122,14 +252,14 @@ class PublicMemberExtractor(ast.NodeVisitor):
                         'decorators': [self.get_decorator_name(dec) for dec in item.decorator_list],
                         'docstring': ast.get_docstring(item),
                         'lineno': item.lineno,
-                        'is_magic': self.is_magic_method(item.name)
+                        'is_magic': kind == _MAGIC
                     }
                     methods.append(method_info)
 
             elif isinstance(item, ast.Assign):
                 # Extract class variables
                 for target in item.targets:
-                    if isinstance(target, ast.Name) and self.is_public_or_magic(target.id):
+                    if isinstance(target, ast.Name) and _classify(target.id) >= _PUBLIC:
                         attr_info = {
                             'name': target.id,
                             'type': 'class_variable',
@@ -140,7 +270,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
 
             elif isinstance(item, ast.AnnAssign):
                 # Extract annotated class variables
-                if isinstance(item.target, ast.Name) and self.is_public_or_magic(item.target.id):
+                if isinstance(item.target, ast.Name) and _classify(item.target.id) >= _PUBLIC:
                     attr_info = {
                         'name': item.target.id,
                         'type': 'annotated_variable',
@@ -167,9 +297,9 @@ class PublicMemberExtractor(ast.NodeVisitor):
         """
         args = []
 
-        # Regular parameters
+        # Regular parameters, interned as names like ``self`` repeat in almost every method
         for arg in node.args.args:
-            args.append(arg.arg)
+            args.append(sys.intern(arg.arg))
 
         # *args
         if node.args.vararg:
@@ -190,12 +320,28 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :return: String representation of the decorator name.
         :rtype: str
         """
-        if isinstance(decorator, ast.Name):
-            return decorator.id
-        elif isinstance(decorator, ast.Attribute):
-            return f"{self.get_node_source(decorator.value)}.{decorator.attr}"
-        else:
-            return self.get_node_source(decorator)
+        try:
+            return _get_decorator_name(decorator)
+        except Exception:
+            return "<unknown>"
+
+    def get_base_name(self, base) -> str:
+        """
+        Get the source code representation of a class base.
+
+        Simple bases (``object``, ``enum.Enum``) are interned, so that the copies repeated
+        across classes share one string. Other expressions (e.g. ``Generic[T]``) are kept as is.
+
+        :param base: The base AST node.
+
+        :return: String representation of the base.
+        :rtype: str
+        """
+        source = self.get_node_source(base)
+        base_type = type(base)
+        if base_type is ast.Name or (base_type is ast.Attribute and type(base.value) is ast.Name):
+            source = sys.intern(source)
+        return source
 
     def get_node_source(self, node) -> str:
         """
@@ -203,30 +349,12 @@ class PublicMemberExtractor(ast.NodeVisitor):
 
         :param node: The AST node to convert to source code.
 
-        :return: String representation of the node's source code.
+        :return: String representation of the node's source code, ``<unknown>`` if it cannot be unparsed.
         :rtype: str
         """
         try:
-            if isinstance(node, ast.Name):
-                return node.id
-            elif isinstance(node, ast.Constant):
-                return repr(node.value)
-            elif isinstance(node, ast.Attribute):
-                return f"{self.get_node_source(node.value)}.{node.attr}"
-            elif isinstance(node, ast.List):
-                elements = [self.get_node_source(elt) for elt in node.elts]
-                return f"[{', '.join(elements)}]"
-            elif isinstance(node, ast.Dict):
-                pairs = []
-                for k, v in zip(node.keys, node.values):
-                    key = self.get_node_source(k) if k else None
-                    value = self.get_node_source(v)
-                    pairs.append(f"{key}: {value}" if key else f"**{value}")
-                return f"{{{', '.join(pairs)}}}"
-            else:
-                # For complex expressions, return type information
-                return f"<{type(node).__name__}>"
-        except:
+            return ast.unparse(node)
+        except Exception:
             return "<unknown>"
 
     def visit_ClassDef(self, node: ast.ClassDef):
@@ -236,12 +364,16 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :param node: The class definition AST node.
         :type node: ast.ClassDef
         """
-        if self.is_public_or_magic(node.name):
+        if _classify(node.name) >= _PUBLIC:
             # Only process top-level public classes
+            if self.docs_mode:
+                self.public_classes.append({'name': node.name, 'member_names': _collect_class_member_names(node)})
+                return
+
             class_info = {
                 'name': node.name,
                 'type': 'class',
-                'bases': [self.get_node_source(base) for base in node.bases],
+                'bases': [self.get_base_name(base) for base in node.bases],
                 'decorators': [self.get_decorator_name(dec) for dec in node.decorator_list],
                 'docstring': ast.get_docstring(node),
                 'lineno': node.lineno,
@@ -249,8 +381,6 @@ class PublicMemberExtractor(ast.NodeVisitor):
             }
             self.public_classes.append(class_info)
 
-        # Don't recursively visit nested classes
-
     def visit_FunctionDef(self, node: ast.FunctionDef):
         """
         Visit a function definition node.
@@ -258,7 +388,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :param node: The function definition AST node.
         :type node: ast.FunctionDef
         """
-        if self.is_public_or_magic(node.name):
+        if _classify(node.name) >= _PUBLIC:
             # Only process top-level public functions
             func_info = {
                 'name': node.name,
@@ -271,8 +401,6 @@ class PublicMemberExtractor(ast.NodeVisitor):
             }
             self.public_functions.append(func_info)
 
-        # self.generic_visit(node)
-
     def visit_Assign(self, node: ast.Assign):
         """
         Visit an assignment statement (variable definition).
@@ -282,7 +410,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
         """
         # Only process top-level variables
         for target in node.targets:
-            if isinstance(target, ast.Name) and self.is_public_or_magic(target.id):
+            if isinstance(target, ast.Name) and _classify(target.id) >= _PUBLIC:
                 var_info = {
                     'name': target.id,
                     'type': 'variable',
@@ -291,8 +419,6 @@ class PublicMemberExtractor(ast.NodeVisitor):
                 }
                 self.public_variables.append(var_info)
 
-        # self.generic_visit(node)
-
     def visit_AnnAssign(self, node: ast.AnnAssign):
         """
         Visit an annotated assignment statement.
@@ -300,7 +426,7 @@ class PublicMemberExtractor(ast.NodeVisitor):
         :param node: The annotated assignment AST node.
         :type node: ast.AnnAssign
         """
-        if isinstance(node.target, ast.Name) and self.is_public_or_magic(node.target.id):
+        if isinstance(node.target, ast.Name) and _classify(node.target.id) >= _PUBLIC:
             var_info = {
                 'name': node.target.id,
                 'type': 'annotated_variable',
@@ -310,15 +436,114 @@ class PublicMemberExtractor(ast.NodeVisitor):
             }
             self.public_variables.append(var_info)
 
-        # self.generic_visit(node)
+
+def _append_member_block(lines: List[str], name: str, directive: str, member_names: Optional[List[str]] = None):
+    """
+    Append the RST section documenting one member to a list of lines.
+
+    :param lines: Lines to append to.
+    :type lines: List[str]
+    :param name: Name of the member.
+    :type name: str
+    :param directive: The autodoc directive, such as ``autoclass``.
+    :type directive: str
+    :param member_names: Names for the ``:members:`` option, it is omitted when empty or None.
+    :type member_names: Optional[List[str]]
+    """
+    lines.append(rst_to_text(name))
+    lines.append('-----------------------------------------------------')
+    lines.append('')
+    lines.append(f'.. {directive}:: {name}')
+    if member_names:
+        lines.append(f'    :members: {",".join(member_names)}')
+    lines.append('')
+    lines.append('')
 
 
-def extract_public_members(source_code: str) -> Dict[str, List[Dict[str, Any]]]:
+class RstEmitter(PublicMemberExtractor):
+    """
+    Emit the RST sections of public members directly while walking a module.
+
+    This is the documentation counterpart of :class:`PublicMemberExtractor`, it visits the same
+    top-level statements but appends the autodoc lines right away instead of building the detail
+    dictionaries. Only the member names of classes are collected, which is all the ``:members:``
+    option needs.
+
+    Example::
+        >>> emitter = RstEmitter()
+        >>> emitter.run(ast.parse("class A:\\n    def f(self): pass"))
+        >>> '    :members: f' in emitter.getvalue()
+        True
+    """
+
+    def __init__(self):
+        """
+        Initialize the RstEmitter with empty line buffers for variables, classes and functions.
+        """
+        super().__init__(docs_mode=True)
+        self._variable_lines: List[str] = []
+        self._class_lines: List[str] = []
+        self._function_lines: List[str] = []
+
+    def getvalue(self) -> str:
+        """
+        Get the emitted RST text, variables first, then classes and functions.
+
+        :return: The RST text of the members, ending with a newline (empty if there are no members).
+        :rtype: str
+        """
+        lines = self._variable_lines + self._class_lines + self._function_lines
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        """
+        Emit the ``autoclass`` section of a public class definition.
+
+        :param node: The class definition AST node.
+        :type node: ast.ClassDef
+        """
+        if _classify(node.name) >= _PUBLIC:
+            _append_member_block(self._class_lines, node.name, 'autoclass', _collect_class_member_names(node))
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        """
+        Emit the ``autofunction`` section of a public function definition.
+
+        :param node: The function definition AST node.
+        :type node: ast.FunctionDef
+        """
+        if _classify(node.name) >= _PUBLIC:
+            _append_member_block(self._function_lines, node.name, 'autofunction')
+
+    def visit_Assign(self, node: ast.Assign):
+        """
+        Emit the ``autodata`` sections of the public names assigned by a statement.
+
+        :param node: The assignment AST node.
+        :type node: ast.Assign
+        """
+        for target in node.targets:
+            if isinstance(target, ast.Name) and _classify(target.id) >= _PUBLIC:
+                _append_member_block(self._variable_lines, target.id, 'autodata')
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        """
+        Emit the ``autodata`` section of a public annotated assignment.
+
+        :param node: The annotated assignment AST node.
+        :type node: ast.AnnAssign
+        """
+        if isinstance(node.target, ast.Name) and _classify(node.target.id) >= _PUBLIC:
+            _append_member_block(self._variable_lines, node.target.id, 'autodata')
+
+
+def extract_public_members(source_code: Union[str, bytes]) -> Dict[str, List[Dict[str, Any]]]:
     """
     Extract public members from Python source code.
 
-    :param source_code: Python source code string.
-    :type source_code: str
+    :param source_code: Python source code, either as a string or as raw bytes (in which case
+        the encoding is detected by :func:`ast.parse` itself, honoring PEP 263 coding cookies).
+    :type source_code: Union[str, bytes]
 
     :return: Dictionary containing 'classes', 'functions', and 'variables' keys.
     :rtype: Dict[str, List[Dict[str, Any]]]
@@ -331,7 +556,7 @@ def extract_public_members(source_code: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     tree = ast.parse(source_code)
     extractor = PublicMemberExtractor()
-    extractor.visit(tree)
+    extractor.run(tree)
 
     return {
         'classes': extractor.public_classes,
@@ -340,19 +565,226 @@ def extract_public_members(source_code: str) -> Dict[str, List[Dict[str, Any]]]:
     }
 
 
+def extract_public_members_rst(source_code: Union[str, bytes]) -> str:
+    """
+    Extract public members from Python source code and format them in RST directly.
+
+    This is the fused form of :func:`extract_public_members` and :func:`print_extracted_members`
+    used by the documentation generator, it produces the same text without building the detail
+    dictionaries of the members.
+
+    :param source_code: Python source code, either as a string or as raw bytes.
+    :type source_code: Union[str, bytes]
+
+    :return: The RST text of the members, ending with a newline (empty if there are no members).
+    :rtype: str
+
+    Example::
+        >>> rst = extract_public_members_rst("def public_func(): pass")
+        >>> '.. autofunction:: public_func' in rst
+        True
+    """
+    tree = ast.parse(source_code)
+    emitter = RstEmitter()
+    emitter.run(tree)
+    return emitter.getvalue()
+
+
 def extract_public_members_from_file(file_path: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Extract public members from a Python file.
 
+    Results are memoized in-process on the file's path, modification time and size, so
+    repeated calls for an unchanged file within one run return the same object, which
+    should not be modified by the caller.
+
+    When ``PYPI_DOWNLOADS_RST_CACHE=1`` is set, the result is also cached on disk (under
+    ``$XDG_CACHE_HOME/pypi_downloads/auto_rst``) keyed by the content of the file, so
+    unchanged files are not parsed again on later runs.
+
     :param file_path: Path to the Python file.
     :type file_path: str
 
     :return: Dictionary containing 'classes', 'functions', and 'variables' keys.
     :rtype: Dict[str, List[Dict[str, Any]]]
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        source_code = f.read()
-    return extract_public_members(source_code)
+    return _process_file_by_stat(file_path, 'members')
+
+
+def extract_public_members_rst_from_file(file_path: str) -> str:
+    """
+    Extract public members from a Python file and format them in RST directly.
+
+    The result is cached the same way as :func:`extract_public_members_from_file`.
+
+    :param file_path: Path to the Python file.
+    :type file_path: str
+
+    :return: The RST text of the members, ending with a newline (empty if there are no members).
+    :rtype: str
+    """
+    return _process_file_by_stat(file_path, 'rst')
+
+
+_FILE_PROCESSORS = {
+    'members': extract_public_members,
+    'rst': extract_public_members_rst,
+}
+
+
+def _process_file_by_stat(file_path: str, kind: str) -> Any:
+    """
+    Process a Python file with the processor of the given kind, memoized on the file's stat.
+
+    :param file_path: Path to the Python file.
+    :type file_path: str
+    :param kind: Key of the processor in ``_FILE_PROCESSORS``.
+    :type kind: str
+
+    :return: The result of the processor.
+    :rtype: Any
+    """
+    stat = os.stat(file_path)
+    return _process_file(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, kind)
+
+
+@lru_cache(maxsize=256)
+def _process_file(file_path: str, mtime_ns: int, size: int, kind: str) -> Any:
+    """
+    Read and process a Python file, memoized on ``(file_path, mtime_ns, size, kind)``.
+
+    :param file_path: Absolute path to the Python file.
+    :type file_path: str
+    :param mtime_ns: Modification time of the file in nanoseconds, only used as part of the memo key.
+    :type mtime_ns: int
+    :param size: Size of the file in bytes, only used as part of the memo key.
+    :type size: int
+    :param kind: Key of the processor in ``_FILE_PROCESSORS``.
+    :type kind: str
+
+    :return: The result of the processor.
+    :rtype: Any
+    """
+    processor = _FILE_PROCESSORS[kind]
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    if not _is_cache_enabled():
+        return processor(data)
+
+    cache_file = _get_cache_file(data, kind)
+    result = _load_cache(cache_file)
+    if result is None:
+        result = processor(data)
+        _save_cache(cache_file, result)
+    return result
+
+
+def _is_cache_enabled() -> bool:
+    """
+    Check whether the on-disk extraction cache is enabled.
+
+    The cache is opt-in via the ``PYPI_DOWNLOADS_RST_CACHE=1`` environment variable,
+    so that CI builds stay deterministic.
+
+    :return: True if the cache is enabled, False otherwise.
+    :rtype: bool
+    """
+    return os.environ.get('PYPI_DOWNLOADS_RST_CACHE', '') == '1'
+
+
+def _get_cache_file(data: bytes, kind: str) -> str:
+    """
+    Get the cache file path for the given source content.
+
+    The key is made of the SHA-256 of the source, the kind of the result, the running
+    Python version (which determines the AST layout) and :data:`_EXTRACTOR_VERSION`.
+
+    :param data: Raw content of the source file.
+    :type data: bytes
+    :param kind: Kind of the cached result, such as ``members`` or ``rst``.
+    :type kind: str
+
+    :return: Path of the pickle file in the cache directory.
+    :rtype: str
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    digest = hashlib.sha256(data).hexdigest()
+    py_version = f'{sys.version_info.major}{sys.version_info.minor}'
+    return os.path.join(cache_home, 'pypi_downloads', 'auto_rst',
+                        f'{digest}-{kind}-py{py_version}-v{_EXTRACTOR_VERSION}.pkl')
+
+
+def _load_cache(cache_file: str) -> Optional[Any]:
+    """
+    Load an extraction result from the cache.
+
+    :param cache_file: Path of the cache file.
+    :type cache_file: str
+
+    :return: The cached result, or None if there is no usable cache entry.
+    :rtype: Optional[Any]
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _save_cache(cache_file: str, result: Any):
+    """
+    Save an extraction result to the cache atomically.
+
+    The pickle is written to a temporary file in the cache directory first and then
+    moved into place with :func:`os.replace`, so concurrent builds never see a partial
+    entry. Failures are ignored, the cache is only an optimization.
+
+    :param cache_file: Path of the cache file.
+    :type cache_file: str
+    :param result: Extraction result to save.
+    :type result: Any
+    """
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+    except OSError:
+        pass
+
+
+def _format_members(members: Dict[str, List[Dict[str, Any]]]) -> str:
+    """
+    Format extracted member information in RST format.
+
+    :param members: Dictionary containing extracted members, classes may be either detailed
+        or extracted in docs mode.
+    :type members: Dict[str, List[Dict[str, Any]]]
+
+    :return: The RST text of the members, ending with a newline (empty if there are no members).
+    :rtype: str
+    """
+    lines: List[str] = []
+    for var in members['variables']:
+        _append_member_block(lines, var['name'], 'autodata')
+    for cls in members['classes']:
+        if 'member_names' in cls:
+            member_names = cls['member_names']
+        else:
+            member_names = [method['name'] for method in cls['members']['methods']] + \
+                           [attr['name'] for attr in cls['members']['attributes']]
+        _append_member_block(lines, cls['name'], 'autoclass', member_names)
+    for func in members['functions']:
+        _append_member_block(lines, func['name'], 'autofunction')
+
+    return '\n'.join(lines) + '\n' if lines else ''
 
 
 def print_extracted_members(f, members: Dict[str, List[Dict[str, Any]]]):
@@ -363,37 +795,7 @@ def print_extracted_members(f, members: Dict[str, List[Dict[str, Any]]]):
     :param members: Dictionary containing extracted members.
     :type members: Dict[str, List[Dict[str, Any]]]
     """
-
-    for var in members['variables']:
-        print(f'{rst_to_text(var["name"])}', file=f)
-        print(f'-----------------------------------------------------', file=f)
-        print(f'', file=f)
-        print(f'.. autodata:: {var["name"]}', file=f)
-        print(f'', file=f)
-        print(f'', file=f)
-
-    for cls in members['classes']:
-        print(f'{rst_to_text(cls["name"])}', file=f)
-        print(f'-----------------------------------------------------', file=f)
-        print(f'', file=f)
-        print(f'.. autoclass:: {cls["name"]}', file=f)
-        member_names = []
-        for method in cls['members']['methods']:
-            member_names.append(method['name'])
-        for attr in cls['members']['attributes']:
-            member_names.append(attr['name'])
-        if member_names:
-            print(f'    :members: {",".join(member_names)}', file=f)
-        print(f'', file=f)
-        print(f'', file=f)
-
-    for func in members['functions']:
-        print(f'{rst_to_text(func["name"])}', file=f)
-        print(f'-----------------------------------------------------', file=f)
-        print(f'', file=f)
-        print(f'.. autofunction:: {func["name"]}', file=f)
-        print(f'', file=f)
-        print(f'', file=f)
+    f.write(_format_members(members))
 
 
 def convert_code_to_rst(code_file: str, rst_file: str, lib_dir: str = '.'):
@@ -413,64 +815,177 @@ def convert_code_to_rst(code_file: str, rst_file: str, lib_dir: str = '.'):
     """
     if os.path.dirname(rst_file):
         os.makedirs(os.path.dirname(rst_file), exist_ok=True)
-    members = extract_public_members(pathlib.Path(code_file).read_text())
-
-    with open(rst_file, 'w') as f:
-        rel_file = os.path.relpath(os.path.abspath(code_file), os.path.abspath(lib_dir))
-        rel_segs = os.path.splitext(rel_file)[0]
-        module_name = rel_segs.replace('/', '.').replace('\\', '.')
-        if module_name.split('.')[-1] == '__init__':
-            module_name = '.'.join(module_name.split('.')[:-1])
-
-        print(f'{rst_to_text(module_name)}', file=f)
-        print(f'========================================================', file=f)
-        print(f'', file=f)
-
-        print(f'.. currentmodule:: {module_name}', file=f)
-        print(f'', file=f)
-        print(f'.. automodule:: {module_name}', file=f)
-        print(f'', file=f)
-        print(f'', file=f)
-
-        if os.path.basename(code_file) != '__init__.py':
-            print_extracted_members(f, members)
-        else:
-            code_rels = []
-            for code_rel_file in os.listdir(os.path.dirname(code_file)):
-                code_rel_base = os.path.splitext(code_rel_file)[0]
-                code_abs_file = os.path.abspath(os.path.join(os.path.dirname(code_file), code_rel_file))
-                if os.path.isfile(code_abs_file) and code_rel_file.endswith('.py') and \
-                        not (code_rel_base.startswith('__') and code_rel_base.endswith('__')):
-                    code_rels.append(code_rel_base)
-                elif os.path.isdir(code_abs_file) and os.path.exists(os.path.join(code_abs_file, '__init__.py')):
-                    code_rels.append(f'{code_rel_base}/index')
-
-            if code_rels:
-                code_rels = natsorted(code_rels)
-                print(f'.. toctree::', file=f)
-                print(f'    :maxdepth: 3', file=f)
-                print(f'', file=f)
-                for code_rel_base in code_rels:
-                    print(f'    {code_rel_base}', file=f)
-                print(f'', file=f)
+    is_package = os.path.basename(code_file) == '__init__.py'
+    rel_file = os.path.relpath(os.path.abspath(code_file), os.path.abspath(lib_dir))
+    rel_segs = os.path.splitext(rel_file)[0]
+    module_name = rel_segs.replace('/', '.').replace('\\', '.')
+    if is_package:
+        module_name = '.'.join(module_name.split('.')[:-1])
+
+    lines = [
+        rst_to_text(module_name),
+        '========================================================',
+        '',
+        f'.. currentmodule:: {module_name}',
+        '',
+        f'.. automodule:: {module_name}',
+        '',
+        '',
+    ]
+    content = '\n'.join(lines) + '\n'
+
+    if not is_package:
+        content += extract_public_members_rst_from_file(code_file)
+    else:
+        # the members of __init__.py are not documented, so it is neither read nor parsed
+        code_rels = []
+        with os.scandir(os.path.dirname(code_file) or '.') as it:
+            for entry in it:
+                code_rel_base, code_rel_ext = os.path.splitext(entry.name)
+                if code_rel_ext == '.py' and entry.is_file():
+                    if not (code_rel_base.startswith('__') and code_rel_base.endswith('__')):
+                        code_rels.append(code_rel_base)
+                elif entry.is_dir() and os.path.exists(os.path.join(entry.path, '__init__.py')):
+                    code_rels.append(f'{entry.name}/index')
+
+        if code_rels:
+            code_rels = natsorted(code_rels)
+            lines = ['.. toctree::', '    :maxdepth: 3', '']
+            for code_rel_base in code_rels:
+                lines.append(f'    {code_rel_base}')
+            lines.append('')
+            content += '\n'.join(lines) + '\n'
+
+    _write_if_changed(rst_file, content)
+
+
+def _write_if_changed(file: str, content: str):
+    """
+    Write content to a file only if it differs from the current content.
+
+    Keeping the file untouched preserves its modification time, so Sphinx does not
+    invalidate its incremental build cache for documents that did not change. The
+    new content is written to a temporary file and moved into place with
+    :func:`os.replace`.
+
+    :param file: Path of the file to write.
+    :type file: str
+    :param content: The full content of the file.
+    :type content: str
+    """
+    if os.path.exists(file):
+        with open(file, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+
+    tmp_file = f'{file}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_file, file)
+
+
+def _convert_one(args: Tuple[str, str, str]):
+    """
+    Convert a single ``(code_file, rst_file, lib_dir)`` tuple, used as the worker of :func:`convert_many`.
+
+    :param args: Arguments of :func:`convert_code_to_rst`.
+    :type args: Tuple[str, str, str]
+    """
+    code_file, rst_file, lib_dir = args
+    convert_code_to_rst(code_file=code_file, rst_file=rst_file, lib_dir=lib_dir)
+
+
+def convert_many(code_files: List[str], rst_files: List[str], lib_dir: str = '.'):
+    """
+    Convert multiple Python code files to RST documentation files.
+
+    The files are independent of each other, so they are converted in parallel with a
+    :class:`multiprocessing.Pool`. Small batches (less than 4 files) are converted
+    serially, where the cost of starting the worker processes is not worth it.
+
+    :param code_files: Paths to the Python source code files.
+    :type code_files: List[str]
+    :param rst_files: Paths to the output RST files, one for each code file.
+    :type rst_files: List[str]
+    :param lib_dir: Base library directory for calculating relative module paths. Defaults to '.'.
+    :type lib_dir: str
+    :raises ValueError: If the numbers of code files and RST files are different.
+
+    Example::
+        >>> convert_many(['src/a.py', 'src/b.py'], ['docs/a.rst', 'docs/b.rst'], lib_dir='src')
+    """
+    if len(code_files) != len(rst_files):
+        raise ValueError(f'Numbers of code files and rst files not match - '
+                         f'{len(code_files)!r} vs {len(rst_files)!r}.')
+
+    tasks = [(code_file, rst_file, lib_dir) for code_file, rst_file in zip(code_files, rst_files)]
+    if len(tasks) < 4:
+        for task in tasks:
+            _convert_one(task)
+    else:
+        with multiprocessing.Pool() as pool:
+            for _ in pool.imap_unordered(_convert_one, tasks, chunksize=8):
+                pass
+
+
+def _load_manifest(manifest_file: str) -> List[Tuple[str, str]]:
+    """
+    Load ``(code_file, rst_file)`` pairs from a batch manifest file.
+
+    Each non-empty line of the manifest contains a code file and an RST file, separated by
+    whitespace (shell-style quoting is supported for paths containing spaces). Lines starting
+    with ``#`` are ignored.
+
+    :param manifest_file: Path to the manifest file.
+    :type manifest_file: str
+
+    :return: List of ``(code_file, rst_file)`` pairs.
+    :rtype: List[Tuple[str, str]]
+    :raises ValueError: If a line does not contain exactly two paths.
+    """
+    pairs = []
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            items = shlex.split(line)
+            if len(items) != 2:
+                raise ValueError(f'Invalid manifest line {lineno} in {manifest_file!r}, '
+                                 f'2 paths expected but {len(items)!r} found - {line!r}.')
+            pairs.append((items[0], items[1]))
+    return pairs
 
 
 def main():
     """
     Main entry point for the command-line interface.
 
-    Parses command-line arguments and converts a Python code file to RST documentation.
+    Parses command-line arguments and converts a Python code file to RST documentation,
+    or a batch of files listed in a manifest when ``--batch-manifest`` is given.
     """
     parser = argparse.ArgumentParser(description='Auto create rst docs for python code file')
-    parser.add_argument('-i', '--input', required=True, help='Input python code file')
-    parser.add_argument('-o', '--output', required=True, help='Output rst doc file')
+    parser.add_argument('-i', '--input', help='Input python code file')
+    parser.add_argument('-o', '--output', help='Output rst doc file')
+    parser.add_argument('--batch-manifest', default=None,
+                        help='Manifest file of "code_file rst_file" lines to convert in parallel')
     args = parser.parse_args()
 
-    convert_code_to_rst(
-        code_file=args.input,
-        rst_file=args.output,
-        lib_dir='.'
-    )
+    if args.batch_manifest:
+        pairs = _load_manifest(args.batch_manifest)
+        convert_many(
+            code_files=[code_file for code_file, _ in pairs],
+            rst_files=[rst_file for _, rst_file in pairs],
+            lib_dir='.'
+        )
+    elif args.input and args.output:
+        convert_code_to_rst(
+            code_file=args.input,
+            rst_file=args.output,
+            lib_dir='.'
+        )
+    else:
+        parser.error('either -i/--input and -o/--output, or --batch-manifest is required')
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ and standalone Python modules (excluding __init__.py and other dunder files).
 """
 
 import argparse
+import io
 import os
 
 from natsort import natsorted
@@ -43,34 +44,48 @@ def main():
     args = parser.parse_args()
 
     rel_names = []
-    for name in os.listdir(args.input_dir):
-        item_path = os.path.join(args.input_dir, name)
-        # Check if it's a package (directory with __init__.py) or a standalone module
-        if (os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, '__init__.py'))) or \
-                (os.path.isfile(item_path) and name.endswith('.py') and not name.startswith('__')):
-            if name.endswith('.py'):
-                # Remove .py extension for modules
-                rel_names.append(os.path.splitext(name)[0])
-            else:
+    package_names = set()
+    with os.scandir(args.input_dir) as it:
+        for entry in it:
+            name = entry.name
+            base, ext = os.path.splitext(name)
+            # Check if it's a package (directory with __init__.py) or a standalone module
+            if ext == '.py' and entry.is_file():
+                if not name.startswith('__'):
+                    # Remove .py extension for modules
+                    rel_names.append(base)
+            elif entry.is_dir() and os.path.exists(os.path.join(entry.path, '__init__.py')):
                 # Keep directory name for packages
                 rel_names.append(name)
+                package_names.add(name)
 
     # Sort names naturally (e.g., module1, module2, module10)
     rel_names = natsorted(rel_names)
-    
-    # Write the RST toctree to output file
-    with open(args.output, 'w') as f:
+
+    # Build the RST toctree in memory
+    with io.StringIO() as f:
         print(f'.. toctree::', file=f)
         print(f'    :maxdepth: 2', file=f)
         print(f'    :caption: API Documentation', file=f)
         print(f'', file=f)
         for name in rel_names:
             # Packages get /index suffix, modules don't
-            if os.path.exists(os.path.join(args.input_dir, name, '__init__.py')):
+            if name in package_names:
                 print(f'    api_doc/{name}/index', file=f)
             else:
                 print(f'    api_doc/{name}', file=f)
         print(f'', file=f)
+        content = f.getvalue()
+
+    # Only rewrite the output file when its content changes, keeping its mtime intact otherwise
+    if os.path.exists(args.output):
+        with open(args.output, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+    tmp_output = f'{args.output}.tmp'
+    with open(tmp_output, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_output, args.output)
 
 
 if __name__ == '__main__':
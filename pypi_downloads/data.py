@@ -7,7 +7,7 @@ automatically download a preprocessed dataset from HuggingFace Hub when needed.
 
 The module contains the following main components:
 
-* :func:`load_data` - Load a cached, read-only DataFrame of download statistics.
+* :func:`load_data` - Load a cached, read-only DataFrame (or Arrow table) of download statistics.
 
 .. note::
    The cached DataFrame is frozen to prevent accidental mutation. Call
@@ -23,15 +23,59 @@ Example::
 
 """
 
-import functools
 import os
+import threading
+from typing import Optional
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 _DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'downloads.parquet')
 _HF_REPO = 'HansBug/pypi_downloads'
 _HF_FILENAME = 'dataset.parquet'
+_COUNT_COLUMNS = ['last_day', 'last_week', 'last_month']
+_COLUMNS = ['name', *_COUNT_COLUMNS, 'updated_at']
+
+# Loaded data, kept in module globals instead of lru caches, so that the hot
+# path of load_data() is a global lookup and an identity check
+_ARROW_TABLE: Optional[pa.Table] = None
+_DATAFRAME: Optional[pd.DataFrame] = None
+_INDEXED_DATAFRAME: Optional[pd.DataFrame] = None
+
+
+def _downcast_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast the download count columns to the narrowest safe integer type.
+
+    Download counts are stored as ``uint32`` when all values are within its range,
+    which halves the footprint of each column compared to ``int64``. Columns with
+    values out of range (or negative values) are kept as ``int64``. The
+    ``updated_at`` column is cast to ``float64``.
+
+    :param df: DataFrame with non-null download count columns.
+    :type df: pandas.DataFrame
+    :return: DataFrame with the casted columns.
+    :rtype: pandas.DataFrame
+
+    Example::
+
+        >>> import pandas as pd
+        >>> from pypi_downloads.data import _downcast_counts
+        >>> df = pd.DataFrame({'name': ['a'], 'last_day': [1.0], 'last_week': [7.0],
+        ...                    'last_month': [30.0], 'updated_at': [1.0]})
+        >>> _downcast_counts(df)['last_day'].dtype
+        dtype('uint32')
+    """
+    limit = np.iinfo(np.uint32).max
+    dtypes = {}
+    for col in _COUNT_COLUMNS:
+        values = df[col]
+        fits = len(values) == 0 or (values.min() >= 0 and values.max() <= limit)
+        dtypes[col] = 'uint32' if fits else 'int64'
+    dtypes['updated_at'] = 'float64'
+    return df.astype(dtypes)
 
 
 def _ensure_data_file() -> None:
@@ -42,8 +86,14 @@ def _ensure_data_file() -> None:
     in the package directory. If it is missing, it attempts to download a
     dataset from HuggingFace Hub and writes a filtered version to the local
     file path. The downloaded dataset is filtered to include only valid
-    records and the columns ``name``, ``last_day``, ``last_week``, and
-    ``last_month``.
+    records and the columns ``name``, ``last_day``, ``last_week``,
+    ``last_month`` and ``updated_at``; only these columns (and ``status``)
+    are read from the downloaded file, and invalid rows are dropped while
+    reading it. The file is written atomically (see
+    :func:`_write_data_file`). Download counts are stored as
+    ``uint32`` when they fit (see :func:`_downcast_counts`), rows are sorted
+    by ``name``, and the file is written with ZSTD compression and a
+    dictionary-encoded ``name`` column to keep it small.
 
     :raises FileNotFoundError: If the data file is missing and cannot be
         downloaded, or if ``huggingface_hub`` is not installed.
@@ -75,9 +125,10 @@ def _ensure_data_file() -> None:
 
     try:
         src = hf_hub_download(repo_id=_HF_REPO, repo_type='dataset', filename=_HF_FILENAME)
-        df = pd.read_parquet(src)
-        df = df[df['status'] == 'valid'][['name', 'last_day', 'last_week', 'last_month', 'updated_at']].reset_index(drop=True).astype({'last_day': 'int64', 'last_week': 'int64', 'last_month': 'int64', 'updated_at': 'float64'})
-        df.to_parquet(_DATA_FILE, index=False)
+        table = pq.read_table(src, columns=['status', *_COLUMNS], filters=[('status', '=', 'valid')])
+        table = table.select(_COLUMNS).sort_by('name')
+        df = _downcast_counts(table.to_pandas())
+        _write_data_file(pa.Table.from_pandas(df, preserve_index=False))
     except Exception as e:
         raise FileNotFoundError(
             f"Data file not found: {_DATA_FILE!r}\n"
@@ -86,6 +137,37 @@ def _ensure_data_file() -> None:
         ) from e
 
 
+def _write_data_file(table: pa.Table) -> None:
+    """
+    Write the local data file atomically.
+
+    The table is written to a temporary file next to ``downloads.parquet``,
+    synced to disk and then moved into place with :func:`os.replace`, so an
+    interrupted write never leaves a truncated data file behind, and
+    concurrent first-time loads in several processes do not clash.
+
+    :param table: Table with the columns of the data file, sorted by ``name``.
+    :type table: pyarrow.Table
+    """
+    tmp_file = f'{_DATA_FILE}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            pq.write_table(
+                table, f,
+                compression='zstd', compression_level=3, use_dictionary=['name'],
+                row_group_size=1 << 16, sorting_columns=[pq.SortingColumn(0)],
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, _DATA_FILE)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
 def _freeze_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
     Freeze a DataFrame by making its underlying arrays read-only.
@@ -95,6 +177,10 @@ def _freeze_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     mutation of cached data. For extension arrays (e.g., Pandas nullable
     dtypes), internal NumPy buffers are also frozen when present.
 
+    The arrays are reached through the DataFrame's internal blocks, which is
+    a single pass regardless of the number of columns. If the block manager
+    is not available, the columns are frozen one by one instead.
+
     :param df: DataFrame to freeze.
     :type df: pandas.DataFrame
     :return: The same DataFrame instance with read-only buffers.
@@ -113,27 +199,129 @@ def _freeze_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         >>> frozen is df
         True
     """
-    for col in df.columns:
-        values = df[col].values
-        if isinstance(values, np.ndarray):
-            values.flags.writeable = False
-        else:
-            # ExtensionArray (e.g., Int64, Float64): freeze internal NumPy arrays.
-            for attr in ('_data', '_mask', '_ndarray'):
-                inner = getattr(values, attr, None)
-                if isinstance(inner, np.ndarray):
-                    inner.flags.writeable = False
+    blocks = getattr(getattr(df, '_mgr', None), 'blocks', None)
+    if blocks is not None:
+        # One pass over the internal blocks, each one may hold several columns.
+        for block in blocks:
+            _freeze_values(block.values)
+    else:
+        for col in df.columns:
+            _freeze_values(df[col].values)
     return df
 
 
-@functools.lru_cache(maxsize=1)
+def _freeze_values(values) -> None:
+    """
+    Make the NumPy buffers behind an array read-only.
+
+    :param values: A NumPy array or a pandas ExtensionArray.
+
+    Example::
+
+        >>> import numpy as np
+        >>> from pypi_downloads.data import _freeze_values
+        >>> arr = np.array([1, 2])
+        >>> _freeze_values(arr)
+        >>> arr.flags.writeable
+        False
+    """
+    if isinstance(values, np.ndarray):
+        values.flags.writeable = False
+    else:
+        # ExtensionArray (e.g., Int64, Float64): freeze internal NumPy arrays.
+        for attr in ('_data', '_mask', '_ndarray'):
+            inner = getattr(values, attr, None)
+            if isinstance(inner, np.ndarray):
+                inner.flags.writeable = False
+
+
+def _is_copy_on_write() -> bool:
+    """
+    Check whether pandas Copy-on-Write mode is active.
+
+    Copy-on-Write is always enabled in pandas 3 and opt-in in pandas 2 via the
+    ``mode.copy_on_write`` option. This package does not change that option
+    itself, since it is process-wide and would affect unrelated user code.
+
+    :return: ``True`` if Copy-on-Write is active, ``False`` otherwise.
+    :rtype: bool
+
+    Example::
+
+        >>> import pandas as pd
+        >>> from pypi_downloads.data import _is_copy_on_write
+        >>> _is_copy_on_write() == (int(pd.__version__.split('.')[0]) >= 3)  # doctest: +SKIP
+        True
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def _cache_clear() -> None:
+    """
+    Drop the cached data, so that the next load reads the data file again.
+
+    Example::
+
+        >>> from pypi_downloads.data import _cache_clear
+        >>> _cache_clear()
+    """
+    global _ARROW_TABLE, _DATAFRAME, _INDEXED_DATAFRAME
+    _ARROW_TABLE = _DATAFRAME = _INDEXED_DATAFRAME = None
+
+
+def _load_arrow_cached() -> pa.Table:
+    """
+    Load and cache the download statistics as an Arrow table.
+
+    This function ensures the data file is present and reads it into a
+    :class:`pyarrow.Table`, which is the primary in-memory form of the data.
+    Arrow tables are immutable, so the cached instance is shared as is.
+
+    The file is opened with :func:`pyarrow.memory_map`, so its pages are
+    mapped by the kernel instead of being copied into a read buffer, and its
+    columns are decoded by multiple threads. Only the documented columns are
+    read, pages of any other column in the file are skipped.
+
+    Since the mapping is backed by the page cache, processes loading the data
+    (e.g. prefork server workers or test workers) already share one copy of
+    the file's bytes; only the decoded columns are private to each process.
+
+    :return: Cached Arrow table with download statistics.
+    :rtype: pyarrow.Table
+    :raises FileNotFoundError: If the data file is missing and cannot be
+        downloaded automatically.
+
+    Example::
+
+        >>> from pypi_downloads.data import _load_arrow_cached
+        >>> table = _load_arrow_cached()
+        >>> table is _load_arrow_cached()
+        True
+    """
+    global _ARROW_TABLE
+    table = _ARROW_TABLE
+    if table is None:
+        _ensure_data_file()
+        # The table keeps the mapped buffers it uses alive, the file itself is closed right away
+        with pa.memory_map(_DATA_FILE, 'r') as source:
+            table = _ARROW_TABLE = pq.read_table(source, columns=_COLUMNS, use_threads=True)
+    return table
+
+
 def _load_cached() -> pd.DataFrame:
     """
     Load and cache the download statistics DataFrame.
 
-    This function ensures the data file is present, reads it into a DataFrame,
-    freezes the underlying arrays to prevent mutation, and returns the cached
-    DataFrame. Subsequent calls return the same cached instance.
+    This function converts the cached Arrow table (see
+    :func:`_load_arrow_cached`) into a DataFrame, freezes the underlying
+    arrays to prevent mutation, and returns the cached DataFrame. Subsequent
+    calls return the same cached instance.
+
+    The table is converted with ``split_blocks=True`` to avoid consolidating
+    columns, so numeric columns without nulls can share the Arrow buffers
+    instead of being copied.
 
     :return: Cached, read-only DataFrame with download statistics.
     :rtype: pandas.DataFrame
@@ -147,12 +335,89 @@ def _load_cached() -> pd.DataFrame:
         >>> df is _load_cached()
         True
     """
-    _ensure_data_file()
-    df = pd.read_parquet(_DATA_FILE)
-    return _freeze_dataframe(df)
+    global _DATAFRAME
+    df = _DATAFRAME
+    if df is None:
+        df = _DATAFRAME = _freeze_dataframe(_load_arrow_cached().to_pandas(split_blocks=True))
+    return df
+
+
+def _load_indexed_cached() -> pd.DataFrame:
+    """
+    Load and cache the download statistics DataFrame indexed by package name.
+
+    The DataFrame is derived from :func:`_load_cached` with ``name`` moved
+    to the index, so lookups like ``df.loc['numpy']`` use the index instead
+    of scanning the whole ``name`` column. The data file is written sorted
+    by ``name``, so the index is monotonic and lookups are binary searches;
+    files written before that are sorted here. It is frozen like the
+    unindexed variant.
+
+    :return: Cached, read-only DataFrame indexed by ``name``.
+    :rtype: pandas.DataFrame
+    :raises FileNotFoundError: If the data file is missing and cannot be
+        downloaded automatically.
+
+    Example::
+
+        >>> from pypi_downloads.data import _load_indexed_cached
+        >>> df = _load_indexed_cached()
+        >>> df.index.name
+        'name'
+    """
+    global _INDEXED_DATAFRAME
+    df = _INDEXED_DATAFRAME
+    if df is None:
+        df = _load_cached().set_index('name')
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        df = _INDEXED_DATAFRAME = _freeze_dataframe(df)
+    return df
 
 
-def load_data(writable: bool = False) -> pd.DataFrame:
+def _prefetch_data_file() -> None:
+    """
+    Ask the kernel to start reading the data file into the page cache.
+
+    Where :func:`os.posix_fadvise` is available, ``POSIX_FADV_WILLNEED`` starts
+    an asynchronous readahead of the whole file and returns immediately.
+    Elsewhere the file is read in 1 MiB chunks by a daemon thread. Either way
+    the first :func:`load_data` call finds the file in a warm cache. Missing
+    files and I/O errors are ignored, this is only a latency optimization.
+
+    Example::
+
+        >>> from pypi_downloads.data import _prefetch_data_file
+        >>> _prefetch_data_file()
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            fd = os.open(_DATA_FILE, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    elif os.path.exists(_DATA_FILE):
+        threading.Thread(target=_read_data_file, daemon=True).start()
+
+
+def _read_data_file() -> None:
+    """
+    Read the data file in 1 MiB chunks and discard the content, to load it into the page cache.
+    """
+    try:
+        with open(_DATA_FILE, 'rb', buffering=0) as f:
+            while f.read(1 << 20):
+                pass
+    except OSError:
+        pass
+
+
+def load_data(writable: bool = False, indexed: bool = False, backend: str = 'pandas'):
     """
     Load PyPI download statistics as a cached DataFrame.
 
@@ -166,16 +431,32 @@ def load_data(writable: bool = False) -> pd.DataFrame:
 
     :param writable: If ``False`` (default), return the shared cached
         DataFrame whose underlying arrays are frozen (read-only).  If
-        ``True``, return a fully writable :meth:`~pandas.DataFrame.copy`
-        of the cached data; the copy is independent and may be modified
-        freely without affecting the cache.
+        ``True``, return a writable :meth:`~pandas.DataFrame.copy` of the
+        cached data; the copy is independent and may be modified freely
+        without affecting the cache. When pandas Copy-on-Write is active
+        (always on pandas 3, opt-in on pandas 2 with
+        ``pd.set_option('mode.copy_on_write', True)``), this is a shallow
+        copy which only copies the columns that actually get modified,
+        otherwise the whole DataFrame is copied.
     :type writable: bool
-    :return: DataFrame with columns ``name``, ``last_day``, ``last_week``,
+    :param indexed: If ``True``, return a (separately cached) DataFrame
+        indexed by ``name`` instead of having it as a column, which is
+        faster for looking up packages by name. Defaults to ``False``.
+    :type indexed: bool
+    :param backend: ``'pandas'`` (default) to return a DataFrame, or
+        ``'arrow'`` to return the cached :class:`pyarrow.Table` itself, which
+        can be scanned with :mod:`pyarrow.compute` without any conversion.
+        Arrow tables are immutable and have no index, so ``writable`` and
+        ``indexed`` are not supported with ``'arrow'``.
+    :type backend: str
+    :return: DataFrame (or Arrow table) with columns ``name``, ``last_day``, ``last_week``,
         ``last_month``, ``updated_at``, containing download statistics for all valid PyPI
-        packages.
-    :rtype: pandas.DataFrame
+        packages. Download counts are unsigned 32-bit integers when they fit.
+    :rtype: pandas.DataFrame or pyarrow.Table
     :raises FileNotFoundError: If ``downloads.parquet`` is missing and cannot
         be downloaded automatically.
+    :raises ValueError: If ``backend`` is unknown, or if ``writable`` or
+        ``indexed`` is used with the ``'arrow'`` backend.
 
     Example::
 
@@ -186,6 +467,26 @@ def load_data(writable: bool = False) -> pd.DataFrame:
         >>> df_copy = load_data(writable=True)
         >>> df_copy is df
         False
+        >>> load_data(indexed=True).loc['numpy', 'last_month']  # doctest: +SKIP
+        135790
+        >>> load_data(backend='arrow').num_columns
+        5
     """
-    df = _load_cached()
-    return df.copy() if writable else df
+    if backend != 'pandas':
+        if backend != 'arrow':
+            raise ValueError(f'Unknown backend - {backend!r}.')
+        if writable or indexed:
+            raise ValueError('Options writable and indexed are not supported with the arrow backend.')
+        return _load_arrow_cached()
+
+    df = _INDEXED_DATAFRAME if indexed else _DATAFRAME
+    if df is None:
+        df = _load_indexed_cached() if indexed else _load_cached()
+    if writable:
+        return df.copy(deep=not _is_copy_on_write())
+    return df
+
+
+# Warm the page cache for the first load, disable with PYPI_DOWNLOADS_PREFETCH=0
+if os.environ.get('PYPI_DOWNLOADS_PREFETCH', '1') == '1':
+    _prefetch_data_file()
@@ -3,12 +3,15 @@ import sys
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from unittest.mock import MagicMock, patch
 
 from pypi_downloads.data import (
-    _DATA_FILE, _HF_FILENAME, _HF_REPO,
-    _ensure_data_file, _freeze_dataframe, _load_cached, load_data,
+    _HF_FILENAME, _HF_REPO,
+    _cache_clear, _downcast_counts, _ensure_data_file, _freeze_dataframe, _is_copy_on_write,
+    _load_cached, _prefetch_data_file, _read_data_file, load_data,
 )
 
 
@@ -24,9 +27,9 @@ def _make_sample_df():
 
 @pytest.fixture(autouse=True)
 def clear_load_cache():
-    _load_cached.cache_clear()
+    _cache_clear()
     yield
-    _load_cached.cache_clear()
+    _cache_clear()
 
 
 @pytest.fixture
@@ -95,15 +98,55 @@ class TestEnsureDataFile:
         assert os.path.exists(dst)
         result = pd.read_parquet(dst)
         assert list(result.columns) == ['name', 'last_day', 'last_week', 'last_month', 'updated_at']
-        assert set(result['name'].tolist()) == {'numpy', 'flask'}  # 'empty' filtered out
-        assert result['last_day'].dtype == np.int64
-        assert result['last_week'].dtype == np.int64
-        assert result['last_month'].dtype == np.int64
+        assert result['name'].tolist() == ['flask', 'numpy']  # 'empty' filtered out, sorted by name
+        assert result['last_day'].dtype == np.uint32
+        assert result['last_week'].dtype == np.uint32
+        assert result['last_month'].dtype == np.uint32
         assert result['updated_at'].dtype == np.float64
+        metadata = pq.ParquetFile(dst).metadata
+        assert metadata.row_group(0).column(0).compression == 'ZSTD'
         mock_hf.hf_hub_download.assert_called_once_with(
             repo_id=_HF_REPO, repo_type='dataset', filename=_HF_FILENAME
         )
 
+    def test_missing_download_write_fails_atomically(self, tmp_path, full_hf_parquet):
+        dst = str(tmp_path / 'downloads.parquet')
+        mock_hf = MagicMock()
+        mock_hf.hf_hub_download.return_value = full_hf_parquet
+
+        with patch('pypi_downloads.data.os.path.exists', return_value=False):
+            with patch.dict(sys.modules, {'huggingface_hub': mock_hf}):
+                with patch('pypi_downloads.data._DATA_FILE', dst):
+                    with patch('pypi_downloads.data.pq.write_table', side_effect=OSError('disk full')):
+                        with pytest.raises(FileNotFoundError):
+                            _ensure_data_file()
+
+        assert sorted(os.listdir(tmp_path)) == ['dataset.parquet']
+
+
+@pytest.mark.unittest
+class TestDowncastCounts:
+    def test_fits_uint32(self):
+        df = _downcast_counts(_make_sample_df())
+        for col in ['last_day', 'last_week', 'last_month']:
+            assert df[col].dtype == np.uint32
+        assert df['updated_at'].dtype == np.float64
+        assert df['last_month'].tolist() == [30000, 60000, 9000]
+
+    def test_out_of_range_kept_int64(self):
+        df = _make_sample_df()
+        df.loc[0, 'last_month'] = 2 ** 32
+        df.loc[1, 'last_day'] = -1
+        df = _downcast_counts(df)
+        assert df['last_month'].dtype == np.int64
+        assert df['last_day'].dtype == np.int64
+        assert df['last_week'].dtype == np.uint32
+        assert df['last_month'].tolist()[0] == 2 ** 32
+
+    def test_empty(self):
+        df = _downcast_counts(_make_sample_df().iloc[:0])
+        assert df['last_day'].dtype == np.uint32
+
 
 @pytest.mark.unittest
 class TestFreezeDataFrame:
@@ -190,6 +233,23 @@ class TestLoadCached:
         assert df['name'].tolist() == ['numpy', 'pandas', 'requests']
         assert df['last_day'].tolist() == [1000, 2000, 300]
 
+    def test_extra_columns_not_read(self, tmp_path):
+        path = str(tmp_path / 'downloads.parquet')
+        df = _make_sample_df()
+        df['url'] = ['u1', 'u2', 'u3']
+        df.to_parquet(path, index=False)
+        with patch('pypi_downloads.data._DATA_FILE', path):
+            df = _load_cached()
+        assert list(df.columns) == ['name', 'last_day', 'last_week', 'last_month', 'updated_at']
+
+    def test_cache_clear_reloads(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            df1 = _load_cached()
+            _cache_clear()
+            df2 = _load_cached()
+        assert df1 is not df2
+        assert df1['name'].tolist() == df2['name'].tolist()
+
     def test_missing_file_raises(self, tmp_path):
         missing = str(tmp_path / 'no_such_file.parquet')
         with patch('pypi_downloads.data._DATA_FILE', missing):
@@ -247,3 +307,123 @@ class TestLoadData:
             df_copy.loc[0, 'last_day'] = 99
             df_frozen = load_data(writable=False)
         assert df_frozen['last_day'].tolist()[0] == 1000
+
+    def test_indexed_lookup(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            df = load_data(indexed=True)
+        assert df.index.name == 'name'
+        assert list(df.columns) == ['last_day', 'last_week', 'last_month', 'updated_at']
+        assert df.loc['pandas', 'last_day'] == 2000
+
+    def test_indexed_cached_and_frozen(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            df1 = load_data(indexed=True)
+            df2 = load_data(indexed=True)
+            df_plain = load_data()
+        assert df1 is df2
+        assert df1 is not df_plain
+        assert not df1['last_day'].values.flags.writeable
+
+    def test_indexed_unsorted_file(self, tmp_path):
+        path = str(tmp_path / 'downloads.parquet')
+        _make_sample_df().iloc[::-1].to_parquet(path, index=False)
+        with patch('pypi_downloads.data._DATA_FILE', path):
+            df = load_data(indexed=True)
+        assert df.index.is_monotonic_increasing
+        assert df.loc['requests', 'last_day'] == 300
+
+    def test_indexed_writable_is_mutable(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            df = load_data(writable=True, indexed=True)
+            df.loc['numpy', 'last_day'] = 99
+            df_frozen = load_data(indexed=True)
+        assert df_frozen.loc['numpy', 'last_day'] == 1000
+
+    def test_writable_deep_copy_without_cow(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            with patch('pypi_downloads.data._is_copy_on_write', return_value=False):
+                df = load_data(writable=True)
+        df.loc[0, 'last_day'] = 99  # must not raise
+        assert df['last_day'].tolist()[0] == 99
+
+    def test_writable_cow_mutation_does_not_affect_cache(self, sample_parquet):
+        if not _is_copy_on_write():
+            pytest.skip('pandas Copy-on-Write is not active')
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            df_copy = load_data(writable=True)
+            df_copy.loc[0, 'last_month'] = 99
+            df_frozen = load_data()
+        assert df_copy['last_month'].tolist()[0] == 99
+        assert df_frozen['last_month'].tolist()[0] == 30000
+
+    def test_arrow_backend(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            table1 = load_data(backend='arrow')
+            table2 = load_data(backend='arrow')
+            df = load_data()
+        assert isinstance(table1, pa.Table)
+        assert table1 is table2
+        assert table1.column_names == ['name', 'last_day', 'last_week', 'last_month', 'updated_at']
+        assert table1.column('last_day').to_pylist() == df['last_day'].tolist()
+
+    def test_arrow_backend_closes_memory_map(self, sample_parquet):
+        opened = []
+        memory_map = pa.memory_map
+
+        def _memory_map(*args, **kwargs):
+            source = memory_map(*args, **kwargs)
+            opened.append(source)
+            return source
+
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet), \
+                patch('pypi_downloads.data.pa.memory_map', side_effect=_memory_map):
+            for _ in range(2):
+                table = load_data(backend='arrow')
+                _cache_clear()
+        assert len(opened) == 2
+        assert all(source.closed for source in opened)
+        assert table.column('name').to_pylist() == ['numpy', 'pandas', 'requests']
+
+    def test_arrow_backend_invalid_options(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            with pytest.raises(ValueError):
+                load_data(writable=True, backend='arrow')
+            with pytest.raises(ValueError):
+                load_data(indexed=True, backend='arrow')
+
+    def test_unknown_backend(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            with pytest.raises(ValueError):
+                load_data(backend='polars')
+
+    def test_shallow_copy_of_cache(self, sample_parquet):
+        # This is why load_data(writable=True) only makes a shallow copy under Copy-on-Write
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            df = load_data().copy(deep=False)
+            if _is_copy_on_write():
+                df.loc[0, 'last_day'] = 99
+                assert df['last_day'].tolist()[0] == 99
+                assert load_data()['last_day'].tolist()[0] == 1000
+            else:
+                with pytest.raises(ValueError):
+                    df.loc[0, 'last_day'] = 99
+
+
+@pytest.mark.unittest
+class TestPrefetchDataFile:
+    def test_existing_file(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            _prefetch_data_file()  # must not raise
+
+    def test_missing_file(self, tmp_path):
+        with patch('pypi_downloads.data._DATA_FILE', str(tmp_path / 'no_such_file.parquet')):
+            _prefetch_data_file()  # must not raise
+            _read_data_file()
+
+    def test_thread_without_fadvise(self, sample_parquet):
+        with patch('pypi_downloads.data._DATA_FILE', sample_parquet):
+            with patch('pypi_downloads.data.os', MagicMock(wraps=os, spec=['open', 'path'])):
+                with patch('pypi_downloads.data.threading.Thread') as mock_thread:
+                    _prefetch_data_file()
+        mock_thread.assert_called_once_with(target=_read_data_file, daemon=True)
+        mock_thread.return_value.start.assert_called_once_with()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.frame import nlargest, to_markdown
+
+
+def _assert_same_as_pandas(df, column, n):
+    expected = df.dropna(subset=[column]).nlargest(n, column, keep='first')
+    pd.testing.assert_frame_equal(nlargest(df, column, n), expected)
+
+
+@pytest.mark.unittest
+class TestNlargest:
+    def test_descending_order(self):
+        df = pd.DataFrame({'name': list('abcde'), 'value': [3, 9, 1, 7, 5]})
+        assert nlargest(df, 'value', 3)['name'].tolist() == ['b', 'd', 'e']
+
+    def test_ties_at_boundary(self):
+        df = pd.DataFrame({'value': pd.array([5, 5, 5, 1, None], dtype='Int64')})
+        assert nlargest(df, 'value', 2).index.tolist() == [0, 1]
+        _assert_same_as_pandas(df, 'value', 2)
+
+    def test_ties_at_boundary_after_larger_values(self):
+        df = pd.DataFrame({'value': [2, 7, 2, 9, 2, 2, 7, 1]})
+        for n in range(1, len(df) + 1):
+            _assert_same_as_pandas(df, 'value', n)
+
+    def test_random_ties(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'value': rng.integers(0, 10, size=200)})
+        for n in (1, 5, 20, 199, 200, 250):
+            _assert_same_as_pandas(df, 'value', n)
+
+    def test_missing_values_never_selected(self):
+        df = pd.DataFrame({'value': [np.nan, 3.0, np.nan]})
+        assert nlargest(df, 'value', 2).index.tolist() == [1]
+
+    def test_empty(self):
+        df = pd.DataFrame({'value': pd.array([], dtype='Int64')})
+        assert len(nlargest(df, 'value', 20)) == 0
+
+
+@pytest.mark.unittest
+class TestToMarkdown:
+    def test_same_as_tabulate(self):
+        df = pd.DataFrame({
+            'name': ['numpy', 'a-much-longer-package-name'],
+            'last_day': pd.array([5, 120000], dtype='Int64'),
+            'status': ['valid', 'valid'],
+        })
+        assert to_markdown(df) == df.to_markdown(index=False)
+
+    def test_missing_values(self):
+        df = pd.DataFrame({
+            'name': ['numpy', 'flask', 'requests'],
+            'last_day': pd.array([5, None, 7], dtype='Int64'),
+            'last_month': pd.array([None, None, None], dtype='Int64'),
+        })
+        assert to_markdown(df) == df.to_markdown(index=False)
+        assert to_markdown(df).splitlines()[3] == '| flask    | <NA>       | <NA>         |'
+
+    def test_empty(self):
+        df = pd.DataFrame({'name': pd.Series([], dtype=object), 'last_day': pd.array([], dtype='Int64')})
+        assert to_markdown(df) == df.to_markdown(index=False)
+
+    def test_numeric_looking_names(self):
+        df = pd.DataFrame({'name': ['00', '1e5'], 'last_day': pd.array([1, 2], dtype='Int64')})
+        assert to_markdown(df).splitlines() == [
+            '| name   |   last_day |',
+            '|:-------|-----------:|',
+            '| 00     |          1 |',
+            '| 1e5    |          2 |',
+        ]
@@ -3,7 +3,10 @@ Download and prepare the PyPI download statistics dataset.
 
 Fetches ``dataset.parquet`` from a HuggingFace Hub dataset repository,
 filters to packages with ``status == 'valid'``, casts download-count columns
-to ``int64``, and writes the result to the package data directory.
+to ``uint32`` (clipped to its range), and writes the result to the package
+data directory with ZSTD compression, a dictionary-encoded ``name`` column
+and byte stream split ``updated_at`` timestamps. Rows are sorted by
+``name``. The whole pipeline runs on Arrow tables, without pandas.
 
 Usage::
 
@@ -15,13 +18,18 @@ Usage::
 import argparse
 import os
 
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from huggingface_hub import hf_hub_download
 
 _DEFAULT_REPO = 'HansBug/pypi_downloads'
 _DEFAULT_OUTPUT = os.path.join('pypi_downloads', 'downloads.parquet')
 _INT_COLS = ['last_day', 'last_week', 'last_month']
 _FLOAT_COLS = ['updated_at']
+# Several row groups let the threaded reader decode them in parallel
+_ROW_GROUP_SIZE = 1 << 16
 
 
 def download_data(repo: str = _DEFAULT_REPO, output: str = _DEFAULT_OUTPUT) -> None:
@@ -33,15 +41,35 @@ def download_data(repo: str = _DEFAULT_REPO, output: str = _DEFAULT_OUTPUT) -> N
     :type output: str
     """
     src = hf_hub_download(repo_id=repo, repo_type='dataset', filename='dataset.parquet')
-    df = pd.read_parquet(src)
-    df = (
-        df[df['status'] == 'valid'][['name'] + _INT_COLS + _FLOAT_COLS]
-        .reset_index(drop=True)
-        .astype({**{col: 'int64' for col in _INT_COLS}, **{col: 'float64' for col in _FLOAT_COLS}})
-    )
+    # Only the needed columns are read, and rows are filtered while reading
+    table = pq.read_table(src, columns=['name', 'status'] + _INT_COLS + _FLOAT_COLS,
+                          filters=[('status', '=', 'valid')])
+    table = table.select(['name'] + _INT_COLS + _FLOAT_COLS).replace_schema_metadata(None)
+
+    # Download counts are far below 2 ** 32, clipping is only a safety net for the uint32 cast
+    limit = np.iinfo(np.uint32).max
+    for col in _INT_COLS:
+        values = pc.min_element_wise(pc.max_element_wise(table[col], 0), limit)
+        table = table.set_column(table.schema.get_field_index(col), col, pc.cast(values, pa.uint32(), safe=False))
+    for col in _FLOAT_COLS:
+        table = table.set_column(table.schema.get_field_index(col), col, pc.cast(table[col], pa.float64()))
+
+    # Rows are sorted by name, so the loader can look packages up with a binary search
+    table = table.sort_by('name')
+
     os.makedirs(os.path.dirname(output), exist_ok=True)
-    df.to_parquet(output, index=False)
-    print(f'Saved {len(df):,} records to {output}')
+    # Only ``name`` is dictionary-encoded, it stays a plain string column in the Arrow schema so
+    # that it is not read back as a categorical column. ``updated_at`` timestamps are close to
+    # each other, splitting their bytes into streams lets ZSTD compress the high bytes well.
+    pq.write_table(
+        table, output,
+        compression='zstd', compression_level=3,
+        use_dictionary=['name'], use_byte_stream_split=_FLOAT_COLS,
+        data_page_size=1 << 20,
+        row_group_size=_ROW_GROUP_SIZE,
+        sorting_columns=[pq.SortingColumn(0)],
+    )
+    print(f'Saved {table.num_rows:,} records to {output}')
 
 
 if __name__ == '__main__':
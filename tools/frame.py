@@ -0,0 +1,108 @@
+"""
+Data frame helpers of the README and charts generated by :mod:`tools.sync`.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def nlargest(df: pd.DataFrame, column: str, n: int) -> pd.DataFrame:
+    """
+    Get the ``n`` rows with the largest values of a column, in descending order.
+
+    It selects the same rows as ``df.nlargest(n, column, keep='first')``: of the
+    rows tied at the smallest selected value, the first ones in row order are
+    kept, and ties are ordered by row. Missing values are never selected. The
+    ``n``-th largest value is found by :func:`numpy.partition` in linear time,
+    and only the selected rows are sorted.
+
+    :param df: Data frame to select from.
+    :type df: pd.DataFrame
+    :param column: Name of the numeric column to order by.
+    :type column: str
+    :param n: Number of rows to select.
+    :type n: int
+
+    :return: The selected rows.
+    :rtype: pd.DataFrame
+
+    Example::
+        >>> df = pd.DataFrame({'name': ['a', 'b', 'c', 'd'], 'value': [5, 5, 5, 1]})
+        >>> nlargest(df, 'value', 2)['name'].tolist()
+        ['a', 'b']
+    """
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    candidates = np.flatnonzero(~np.isnan(values))
+    if n <= 0:
+        candidates = candidates[:0]
+    elif len(candidates) > n:
+        candidate_values = values[candidates]
+        kth = np.partition(candidate_values, -n)[-n]
+        # All the rows above the cut-off value, then the first rows tied at it
+        above = candidates[candidate_values > kth]
+        tied = candidates[candidate_values == kth][:n - len(above)]
+        candidates = np.sort(np.concatenate([above, tied]))
+    order = np.lexsort((candidates, -values[candidates]))
+    return df.iloc[candidates[order]]
+
+
+def to_markdown(df: pd.DataFrame) -> str:
+    """
+    Format a frame as a markdown pipe table, without the index.
+
+    The output is the same as ``df.to_markdown(index=False)`` for the integer
+    and string columns of the README, but the cells are formatted directly
+    instead of through :mod:`tabulate`. Numeric columns are right-aligned and
+    the others left-aligned. Missing values of nullable columns are printed as
+    ``<NA>``, and such a column is left-aligned, like :mod:`tabulate` does.
+    Unlike :mod:`tabulate`, strings are never parsed as numbers, so a column of
+    numeric-looking package names such as ``00`` or ``1e5`` stays left-aligned
+    and is written as it is, and float cells are not aligned on the decimal
+    point.
+
+    :param df: The frame to format.
+    :type df: pd.DataFrame
+
+    :return: The markdown table, without a trailing newline.
+    :rtype: str
+
+    Example::
+        >>> print(to_markdown(pd.DataFrame({'name': ['numpy'], 'last_day': [5]})))
+        | name   |   last_day |
+        |:-------|-----------:|
+        | numpy  |          5 |
+    """
+    headers, cells, aligns = [], [], []
+    for column in df.columns:
+        values = df[column].tolist()
+        headers.append(str(column))
+        cells.append(['' if value is None else str(value) for value in values])
+        if not values:
+            aligns.append(None)
+        elif pd.api.types.is_numeric_dtype(df[column].dtype) and not any(value is pd.NA for value in values):
+            aligns.append('right')
+        else:
+            aligns.append('left')
+    # The headers are padded by 2, as tabulate does
+    widths = [max([len(header) + 2, *map(len, column)]) for header, column in zip(headers, cells)]
+
+    def _row(values):
+        return '| ' + ' | '.join(
+            value.rjust(width) if align == 'right' else value.ljust(width)
+            for value, width, align in zip(values, widths, aligns)
+        ) + ' |'
+
+    def _rule(width, align):
+        if align == 'right':
+            return '-' * (width + 1) + ':'
+        elif align == 'left':
+            return ':' + '-' * (width + 1)
+        else:
+            return '-' * (width + 2)
+
+    lines = [
+        _row(headers),
+        '|' + '|'.join(_rule(width, align) for width, align in zip(widths, aligns)) + '|',
+    ]
+    lines.extend(_row(values) for values in zip(*cells))
+    return '\n'.join(lines)
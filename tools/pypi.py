@@ -7,24 +7,36 @@ simple index page and parses them into structured data objects.
 
 The module can be used as a library or run as a standalone script to display 
 statistics about available PyPI packages.
+
+When ``PYPI_DOWNLOADS_INDEX_CACHE=1`` is set, the parsed index is cached on disk for the
+current UTC day (under ``$XDG_CACHE_HOME/pypi_downloads/index``), so later runs on the same
+day load it from a parquet file instead of downloading and parsing the whole index again.
 """
 
-from dataclasses import dataclass
-from typing import Optional, List
-from urllib.parse import urljoin
+import glob
+import hashlib
+import os
+import tempfile
+import time
+from typing import Optional, List, Iterator, NamedTuple, Tuple
+from urllib.parse import urljoin, urlsplit
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
-from pyquery import PyQuery as pq
+from lxml import etree
 
 from .utils import get_requests_session
 
 DEFAULT_INDEX_URL = 'https://pypi.org/simple'
 
 
-@dataclass
-class PypiItem:
+class PypiItem(NamedTuple):
     """
-    Data class representing a PyPI package item.
+    Named tuple representing a PyPI package item.
+
+    It is an immutable tuple without per-instance ``__dict__``, which keeps the
+    hundreds of thousands of items of the index small.
     
     :param name: The name of the PyPI package.
     :type name: str
@@ -42,6 +54,12 @@ def get_pypi_index(index_url: Optional[str] = None, session: Optional[requests.S
     This function sends an HTTP GET request to the PyPI simple index URL,
     parses the HTML response, and extracts all package names and their
     corresponding URLs.
+
+    The page is streamed and parsed incrementally with :func:`lxml.etree.iterparse`,
+    each anchor is dropped once it has been read, so neither the whole document
+    nor its whole tree is held in memory. Links with an absolute path (all of
+    them on PyPI) are joined to the origin of the index by concatenation instead
+    of a full :func:`urllib.parse.urljoin`.
     
     :param index_url: The PyPI simple index URL to fetch from. If None, uses the default PyPI URL.
     :type index_url: Optional[str]
@@ -64,54 +82,171 @@ def get_pypi_index(index_url: Optional[str] = None, session: Optional[requests.S
         >>> print(len(packages))
         5000
     """
+    names, urls = get_pypi_index_columnar(index_url, session)
+    return [PypiItem(name, url) for name, url in zip(names, urls)]
+
+
+def get_pypi_index_columnar(index_url: Optional[str] = None, session: Optional[requests.Session] = None) \
+        -> Tuple[List[str], List[str]]:
+    """
+    Fetch and parse the PyPI simple index into parallel lists of names and URLs.
+
+    This is the columnar form of :func:`get_pypi_index`, which does not create an
+    item object per package. It is preferable when the result is turned into a
+    table, or when only the names are needed.
+
+    :param index_url: The PyPI simple index URL to fetch from. If None, uses the default PyPI URL.
+    :type index_url: Optional[str]
+    :param session: Optional requests session to use for the HTTP request. If None, creates a new session.
+    :type session: Optional[requests.Session]
+
+    :return: A tuple of the package names and their URLs, in the order of the index.
+    :rtype: Tuple[List[str], List[str]]
+
+    :raises requests.exceptions.HTTPError: If the HTTP request fails.
+
+    Example::
+        >>> names, urls = get_pypi_index_columnar()
+        >>> names[0], urls[0]
+        ('0', 'https://pypi.org/simple/0/')
+    """
+    index_url = index_url or DEFAULT_INDEX_URL
+    cache_file = _get_cache_file(index_url) if _is_cache_enabled() else None
+    if cache_file and os.path.exists(cache_file):
+        table = pq.read_table(cache_file, columns=['name', 'url'])
+        return table['name'].to_pylist(), table['url'].to_pylist()
+
+    names, urls = [], []
+    for name, url in _iter_pypi_index(index_url, session):
+        names.append(name)
+        urls.append(url)
+    if cache_file:
+        _save_cache(cache_file, names, urls)
+    return names, urls
+
+
+def _is_cache_enabled() -> bool:
+    """
+    Check whether the on-disk index cache is enabled with ``PYPI_DOWNLOADS_INDEX_CACHE=1``.
+
+    :return: True if the cache is enabled, False otherwise.
+    :rtype: bool
+    """
+    return os.environ.get('PYPI_DOWNLOADS_INDEX_CACHE', '') == '1'
+
+
+def _get_cache_file(index_url: str) -> str:
+    """
+    Get the cache file path of an index for the current UTC day.
+
+    :param index_url: The URL of the index.
+    :type index_url: str
+
+    :return: Path of the parquet file in the cache directory.
+    :rtype: str
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    digest = hashlib.sha1(index_url.encode('utf-8')).hexdigest()[:16]
+    today = time.strftime('%Y-%m-%d', time.gmtime())
+    return os.path.join(cache_home, 'pypi_downloads', 'index', f'{today}-{digest}.parquet')
+
+
+def _save_cache(cache_file: str, names: List[str], urls: List[str]):
+    """
+    Save an index to the cache atomically, and remove the files of earlier days of the same index.
+    Failures are ignored since the cache is only an optimization.
+
+    :param cache_file: Path of the cache file.
+    :type cache_file: str
+    :param names: The package names.
+    :type names: List[str]
+    :param urls: The package URLs.
+    :type urls: List[str]
+    """
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pq.write_table(pa.table({'name': names, 'url': urls}), f, compression='zstd')
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+
+        suffix = os.path.basename(cache_file)[len('YYYY-MM-DD'):]
+        for file in glob.glob(os.path.join(glob.escape(cache_dir), f'*{suffix}')):
+            if file != cache_file:
+                os.remove(file)
+    except OSError:
+        pass
+
+
+def _iter_pypi_index(index_url: Optional[str] = None, session: Optional[requests.Session] = None) \
+        -> Iterator[Tuple[str, str]]:
+    """
+    Stream the PyPI simple index and yield the name and URL of each package.
+
+    :param index_url: The PyPI simple index URL to fetch from. If None, uses the default PyPI URL.
+    :type index_url: Optional[str]
+    :param session: Optional requests session to use for the HTTP request. If None, creates a new session.
+    :type session: Optional[requests.Session]
+
+    :return: Iterator of ``(name, url)`` tuples.
+    :rtype: Iterator[Tuple[str, str]]
+    """
     index_url = index_url or DEFAULT_INDEX_URL
     session = session or get_requests_session()
-    resp = session.get(index_url)
-    resp.raise_for_status()
+    with session.get(index_url, stream=True) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
 
-    page = pq(resp.text)
-    items = []
-    for aitem in page('a').items():
-        name = aitem.text().strip()
-        url = urljoin(resp.url, aitem.attr('href'))
-        items.append(PypiItem(name, url))
+        base_url = resp.url
+        split = urlsplit(base_url)
+        origin = f'{split.scheme}://{split.netloc}'
+        for _, anchor in etree.iterparse(resp.raw, events=('end',), tag='a', html=True):
+            href = anchor.get('href') or ''
+            if href[:1] == '/' and href[1:2] != '/':
+                url = origin + href
+            else:
+                url = urljoin(base_url, href)
+            yield (anchor.text or '').strip(), url
 
-    return items
+            # Drop the parsed anchors, so that the tree does not grow with the document
+            anchor.clear()
+            while anchor.getprevious() is not None:
+                del anchor.getparent()[0]
 
 
 if __name__ == '__main__':
     print("Fetching PyPI package index...")
 
-    # Get all packages from PyPI
-    packages = get_pypi_index()
+    # Get all packages from PyPI, as parallel lists of names and URLs
+    names, urls = get_pypi_index_columnar()
 
     # Display total count
-    print(f"\nTotal packages found: {len(packages):,}")
+    print(f"\nTotal packages found: {len(names):,}")
 
     # Show some well-known packages
     print("\nLooking for some popular packages:")
-    popular_packages = ['numpy', 'pandas', 'requests', 'django', 'flask']
-    found_popular = []
-
-    for package in packages:
-        if package.name.lower() in popular_packages:
-            found_popular.append(package)
-            print(f"✓ Found: {package.name} -> {package.url}")
+    popular_packages = {'numpy', 'pandas', 'requests', 'django', 'flask'}
+    for name, url in zip(names, urls):
+        if name.lower() in popular_packages:
+            print(f"✓ Found: {name} -> {url}")
 
     # Display first 10 packages as examples
     print(f"\nFirst 10 packages (alphabetically):")
-    for i, package in enumerate(packages[:10]):
-        print(f"{i + 1:2d}. {package.name}")
+    for i, name in enumerate(names[:10]):
+        print(f"{i + 1:2d}. {name}")
 
     # Create pandas DataFrame for better visualization
     try:
+        import numpy as np
         import pandas as pd
 
-        # Convert to DataFrame
-        df = pd.DataFrame([
-            {'Package Name': item.name, 'URL': item.url}
-            for item in packages
-        ])
+        # Build the DataFrame from the columns directly
+        df = pd.DataFrame({'Package Name': names, 'URL': urls})
 
         print(f"\nPandas DataFrame Info:")
         print(f"Shape: {df.shape}")
@@ -123,19 +258,17 @@ if __name__ == '__main__':
 
         # Some statistics
         print(f"\nPackage name length statistics:")
-        df['name_length'] = df['Package Name'].str.len()
-        print(df['name_length'].describe())
+        lengths = np.fromiter(map(len, names), dtype=np.int32, count=len(names))
+        print(pd.Series(lengths, name='name_length').describe())
 
         # Show packages with shortest and longest names
-        shortest_name = df.loc[df['name_length'].idxmin()]
-        longest_name = df.loc[df['name_length'].idxmax()]
-
-        print(f"\nShortest package name: '{shortest_name['Package Name']}' ({shortest_name['name_length']} chars)")
-        print(f"Longest package name: '{longest_name['Package Name']}' ({longest_name['name_length']} chars)")
+        shortest, longest = int(lengths.argmin()), int(lengths.argmax())
+        print(f"\nShortest package name: '{names[shortest]}' ({lengths[shortest]} chars)")
+        print(f"Longest package name: '{names[longest]}' ({lengths[longest]} chars)")
 
     except ImportError:
         print("\nPandas not installed. Install with: pip install pandas")
         print("Showing raw data structure instead:")
         print(f"Sample package objects:")
-        for i, package in enumerate(packages[:3]):
-            print(f"{i + 1}. PypiItem(name='{package.name}', url='{package.url}')")
+        for i, (name, url) in enumerate(zip(names[:3], urls[:3])):
+            print(f"{i + 1}. PypiItem(name='{name}', url='{url}')")
@@ -4,9 +4,21 @@ Module for retrieving recent download statistics from PyPI Stats API.
 This module provides functionality to fetch recent download statistics for Python packages
 from the PyPI Stats service (pypistats.org). It can retrieve download counts for the last
 day, week, and month for any given package.
+
+When ``PYPI_DOWNLOADS_RECENT_CACHE=1`` is set, responses are cached on disk (under
+``$XDG_CACHE_HOME/pypi_downloads/recent``) together with their ``ETag`` and ``Last-Modified``
+headers, and later requests for the same package are sent as conditional requests, so
+unchanged statistics are answered with ``304 Not Modified`` and not downloaded again.
+The statistics are only updated once a day, so a package already fetched on the same
+UTC day is answered from the cache without any request at all. Packages without statistics
+(``404 Not Found``) are not cached, and are requested again every time.
 """
 
 import json
+import os
+import tempfile
+import time
+from functools import lru_cache
 from typing import Optional
 
 import requests
@@ -14,6 +26,92 @@ import requests
 from ..utils import get_requests_session
 
 
+@lru_cache()
+def _default_session() -> requests.Session:
+    """
+    Get the session shared by all calls without an explicit session, so that connections are kept alive.
+
+    :return: The shared requests session.
+    :rtype: requests.Session
+    """
+    return get_requests_session()
+
+
+def _is_cache_enabled() -> bool:
+    """
+    Check whether the on-disk response cache is enabled with ``PYPI_DOWNLOADS_RECENT_CACHE=1``.
+
+    :return: True if the cache is enabled, False otherwise.
+    :rtype: bool
+    """
+    return os.environ.get('PYPI_DOWNLOADS_RECENT_CACHE', '') == '1'
+
+
+def _get_cache_file(name: str) -> str:
+    """
+    Get the cache file path of a package.
+
+    :param name: The name of the PyPI package.
+    :type name: str
+
+    :return: Path of the JSON file in the cache directory.
+    :rtype: str
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'pypi_downloads', 'recent', f'{name}.json')
+
+
+def _today() -> str:
+    """
+    Get the current UTC date, which is the date the cache entries are saved with.
+
+    :return: The date in ``YYYY-MM-DD`` format.
+    :rtype: str
+    """
+    return time.strftime('%Y-%m-%d', time.gmtime())
+
+
+def _load_cache(cache_file: str) -> Optional[dict]:
+    """
+    Load a cached response, with the keys ``date``, ``etag``, ``last_modified`` and ``data``.
+
+    :param cache_file: Path of the cache file.
+    :type cache_file: str
+
+    :return: The cache entry, or None if there is no usable one.
+    :rtype: Optional[dict]
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cache(cache_file: str, entry: dict):
+    """
+    Save a cache entry atomically, failures are ignored since the cache is only an optimization.
+
+    :param cache_file: Path of the cache file.
+    :type cache_file: str
+    :param entry: The cache entry to save.
+    :type entry: dict
+    """
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+    except OSError:
+        pass
+
+
 def get_pypistats_recent(name: str, session: Optional[requests.Session] = None) -> Optional[dict]:
     """
     Get recent download statistics for a PyPI package.
@@ -24,7 +122,8 @@ def get_pypistats_recent(name: str, session: Optional[requests.Session] = None)
 
     :param name: The name of the PyPI package to query.
     :type name: str
-    :param session: Optional requests session to use for the HTTP request. If None, a new session will be created.
+    :param session: Optional requests session to use for the HTTP request. If None, a session shared
+        by all such calls is used.
     :type session: Optional[requests.Session]
 
     :return: A dictionary containing the package download statistics with the following structure:
@@ -60,13 +159,35 @@ def get_pypistats_recent(name: str, session: Optional[requests.Session] = None)
             "type": "recent_downloads"
         }
     """
-    session = session or get_requests_session()
-    resp = session.get(f'https://pypistats.org/api/packages/{name}/recent')
-    if resp.status_code == 404:
+    session = session or _default_session()
+    cache_file = _get_cache_file(name) if _is_cache_enabled() else None
+    cached = _load_cache(cache_file) if cache_file else None
+    today = _today()
+    if cached and cached.get('date') == today:
+        return cached['data']
+
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    resp = session.get(f'https://pypistats.org/api/packages/{name}/recent', headers=headers or None)
+    if resp.status_code == 304 and cached:
+        data = cached['data']
+        etag, last_modified = cached.get('etag'), cached.get('last_modified')
+    elif resp.status_code == 404:
+        # Not cached, the package may get its statistics later on the same day
         return None
     else:
         resp.raise_for_status()
-        return resp.json()
+        data = resp.json()
+        etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+
+    if cache_file:
+        _save_cache(cache_file, {'date': today, 'etag': etag, 'last_modified': last_modified, 'data': data})
+    return data
 
 
 if __name__ == '__main__':
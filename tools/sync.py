@@ -1,25 +1,170 @@
 import logging
 import os.path
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
 from threading import Lock
-from typing import Optional
+from typing import Optional, Dict
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from hbutils.concurrent import parallel_call
 from hbutils.logging import ColoredFormatter
 from hbutils.system import TemporaryDirectory
 from hfutils.operate import get_hf_client, get_hf_fs, upload_directory_as_directory
 from hfutils.utils import number_to_tag
-from natsort import natsorted
 
-from .pypi import get_pypi_index
+from .frame import nlargest, to_markdown
+from .pypi import get_pypi_index_columnar
 from .pypistats.recent import get_pypistats_recent
 from .utils import get_requests_session
 
 
-def sync(repository: str, proxy_pool: Optional[str] = None, deploy_span: float = 5 * 60):
+# Download counts are stored as nullable integers, a month of the most popular packages is too close to 2 ** 31
+_DATASET_SCHEMA = pa.schema([
+    ('name', pa.string()),
+    ('url', pa.string()),
+    ('last_day', pa.int64()),
+    ('last_week', pa.int64()),
+    ('last_month', pa.int64()),
+    ('status', pa.string()),
+    ('updated_at', pa.float64()),
+])
+_DATASET_COLUMNS = _DATASET_SCHEMA.names
+_DELTA_DIR = 'delta'
+_ROW_GROUP_SIZE = 1 << 16
+
+
+def _read_dataset_parquet(path: str, names: pa.Array) -> pd.DataFrame:
+    """
+    Read the columns used by the sync from a dataset parquet file, keeping only the given packages.
+
+    Only the column chunks of :data:`_DATASET_COLUMNS` are decoded, and the ones
+    an older file does not have are left out. The memory-mapped file is streamed
+    in batches, and each batch is filtered before the next one is read, so the
+    rows of the packages no longer in the index are never all held in memory.
+    The Arrow buffers are released column by column while the DataFrame is built,
+    so the table and the frame are not both held in memory.
+
+    :param path: Path of the parquet file.
+    :type path: str
+    :param names: Names of the packages to keep.
+    :type names: pa.Array
+
+    :return: The loaded dataset.
+    :rtype: pd.DataFrame
+    """
+    pf = pq.ParquetFile(path, memory_map=True)
+    columns = [column for column in _DATASET_COLUMNS if column in pf.schema_arrow.names]
+    batches = [
+        batch.filter(pc.is_in(batch.column('name'), value_set=names))
+        for batch in pf.iter_batches(batch_size=_ROW_GROUP_SIZE, columns=columns, use_threads=True)
+    ]
+    schema = pa.schema([pf.schema_arrow.field(column) for column in columns])
+    return pa.Table.from_batches(batches, schema=schema).to_pandas(self_destruct=True, split_blocks=True)
+
+
+def _build_table(columns: Dict[str, np.ndarray]) -> pa.Table:
+    """
+    Build a dataset table from the column arrays of the sync.
+
+    :param columns: Column arrays, with missing counts and timestamps as NaN.
+    :type columns: Dict[str, np.ndarray]
+
+    :return: The table, with the schema :data:`_DATASET_SCHEMA`.
+    :rtype: pa.Table
+    """
+    return pa.Table.from_arrays(
+        [pa.array(columns[field.name], type=field.type, from_pandas=True) for field in _DATASET_SCHEMA],
+        schema=_DATASET_SCHEMA,
+    )
+
+
+def _apply_delta(columns: Dict[str, np.ndarray], name_to_idx: Dict[str, int], table: pa.Table) -> int:
+    """
+    Apply a delta table of updated packages to the column arrays of the sync.
+
+    Packages of the delta which are no longer in the index are ignored.
+
+    :param columns: Column arrays to update in place.
+    :type columns: Dict[str, np.ndarray]
+    :param name_to_idx: Row index of each package name.
+    :type name_to_idx: Dict[str, int]
+    :param table: Delta table, with the schema :data:`_DATASET_SCHEMA`.
+    :type table: pa.Table
+
+    :return: Number of updated rows.
+    :rtype: int
+    """
+    rows = np.fromiter((name_to_idx.get(name, -1) for name in table['name'].to_pylist()),
+                       dtype=np.intp, count=len(table))
+    found = rows >= 0
+    for field in _DATASET_SCHEMA:
+        if field.name not in ('name', 'url'):
+            values = table[field.name].to_numpy()
+            columns[field.name][rows[found]] = values[found]
+    return int(found.sum())
+
+
+def _to_column(df: pd.DataFrame, name: str, dtype, size: int, missing) -> np.ndarray:
+    """
+    Copy a column of the loaded dataset into a new array of the given size.
+
+    Rows after the loaded ones, and all rows when the column is absent, are
+    filled with the ``missing`` value.
+
+    :param df: Loaded dataset.
+    :type df: pd.DataFrame
+    :param name: Name of the column.
+    :type name: str
+    :param dtype: Data type of the array.
+    :param size: Length of the array, not less than the length of ``df``.
+    :type size: int
+    :param missing: Value of the missing rows.
+
+    :return: The column array.
+    :rtype: np.ndarray
+    """
+    column = np.full(size, missing, dtype=dtype)
+    if name in df.columns:
+        column[:len(df)] = df[name].to_numpy(dtype=dtype, na_value=missing)
+    return column
+
+
+def _write_bucketed_parquet(table: pa.Table, path: str):
+    """
+    Write a name-sorted table to parquet, with row groups aligned to name buckets.
+
+    A row group never spans two buckets, and a large bucket is split into row
+    groups of :data:`_ROW_GROUP_SIZE` rows from its start. So a bucket without any
+    updated package is serialized to exactly the same bytes as in the previous
+    deployment, and the chunk-level deduplication of the Hugging Face storage
+    backend only has to transfer the row groups that actually changed. The small
+    row groups also let readers skip most of the file with predicate pushdown.
+
+    The file is compressed with zstd, and the low-cardinality ``status`` column is
+    dictionary encoded, while the unique names and URLs are stored plain.
+
+    :param table: Table to write, sorted by the ``name`` column.
+    :type table: pa.Table
+    :param path: Path of the parquet file.
+    :type path: str
+    """
+    keys = pc.utf8_slice_codeunits(table['name'], 0, 1).to_numpy(zero_copy_only=False)
+    bounds = [0, *(np.flatnonzero(keys[1:] != keys[:-1]) + 1).tolist(), len(table)]
+    with pq.ParquetWriter(path, table.schema, compression='zstd', compression_level=3,
+                          use_dictionary=['status']) as writer:
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end > start:
+                writer.write_table(table.slice(start, end - start), row_group_size=_ROW_GROUP_SIZE)
+
+
+def sync(repository: str, proxy_pool: Optional[str] = None, deploy_span: float = 5 * 60, max_workers: int = 96,
+         full_deploy_threshold: int = 1000):
     hf_client = get_hf_client()
     hf_fs = get_hf_fs()
 
@@ -33,7 +178,8 @@ def sync(repository: str, proxy_pool: Optional[str] = None, deploy_span: float =
             os.linesep.join(attr_lines),
         )
 
-    session = get_requests_session()
+    # One pooled connection per worker, so that the workers never wait for each other's connections
+    session = get_requests_session(pool_size=max_workers)
     if proxy_pool:
         logging.info(f'Proxy pool {proxy_pool!r} enabled.')
         session.proxies.update({
@@ -42,82 +188,108 @@ def sync(repository: str, proxy_pool: Optional[str] = None, deploy_span: float =
         })
 
     logging.info('Getting index ...')
-    d_index = {item.name: item for item in get_pypi_index(session=session)}
+    index_names, index_urls = get_pypi_index_columnar(session=session)
+    index_names = pa.array(index_names, type=pa.string())
+    index_urls = pa.array(index_urls, type=pa.string())
 
-    if hf_client.file_exists(
-            repo_id=repository,
-            repo_type='dataset',
-            filename='dataset.parquet'
-    ):
+    # List the repository once, instead of asking for each candidate file
+    repo_files = set(hf_client.list_repo_files(repo_id=repository, repo_type='dataset'))
+    if 'dataset.parquet' in repo_files:
         logging.info('Load from repository ...')
-        df = pd.read_parquet(hf_client.hf_hub_download(
+        df = _read_dataset_parquet(hf_client.hf_hub_download(
             repo_id=repository,
             repo_type='dataset',
             filename='dataset.parquet'
-        ))
-        df = df[df['name'].isin(d_index)]
-        names = set(df['name'])
-        records = df.to_dict('records')
+        ), index_names)
         has_status = 'status' in df.columns
-    elif hf_client.file_exists(
-            repo_id=repository,
-            repo_type='dataset',
-            filename='dataset.csv'
-    ):
+    elif 'dataset.csv' in repo_files:
         logging.info('Load from repository ...')
         df = pd.read_csv(hf_client.hf_hub_download(
             repo_id=repository,
             repo_type='dataset',
             filename='dataset.csv'
         ))
-        df = df[df['name'].isin(d_index)]
-        names = set(df['name'])
-        records = df.to_dict('records')
         has_status = 'status' in df.columns
     else:
         logging.info(f'No existing file found.')
-        names = set()
-        records = []
+        df = pd.DataFrame(columns=['name', 'url'])
         has_status = False
 
-    for name, item in d_index.items():
-        if name not in names:
-            records.append({
-                'name': name,
-                'url': item.url,
-                'last_day': None,
-                'last_month': None,
-                'last_week': None,
-                'status': None,
-                'updated_at': None,
-            })
-
-    d_records = {item['name']: item for item in records}
-
-    df_x = pd.DataFrame(records)
+    # Drop the packages no longer in the index, with a hash probe in Arrow instead of a per-row dict lookup,
+    # the parquet dataset is already filtered while it is read, the CSV one is filtered here
+    loaded_names = pa.array(df['name'].to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    in_index = pc.is_in(loaded_names, value_set=index_names).to_numpy(zero_copy_only=False)
+    df = df[in_index]
+    loaded_names = loaded_names.filter(in_index)
+
+    # Keep the records as column arrays, new packages of the index are appended after the loaded ones
+    missing = pc.invert(pc.is_in(index_names, value_set=loaded_names))
+    missing_names = index_names.filter(missing).to_numpy(zero_copy_only=False)
+    size = len(df) + len(missing_names)
+    columns = {
+        'name': _to_column(df, 'name', object, size, None),
+        'url': _to_column(df, 'url', object, size, None),
+        'last_day': _to_column(df, 'last_day', np.float64, size, np.nan),
+        'last_week': _to_column(df, 'last_week', np.float64, size, np.nan),
+        'last_month': _to_column(df, 'last_month', np.float64, size, np.nan),
+        'status': _to_column(df, 'status', object, size, None),
+        'updated_at': _to_column(df, 'updated_at', np.float64, size, np.nan),
+    }
+    columns['name'][len(df):] = missing_names
+    columns['url'][len(df):] = index_urls.filter(missing).to_numpy(zero_copy_only=False)
+
+    # Sort the rows by name once, the deployments and the refresh list rely on this order
+    order = pc.sort_indices(pa.array(columns['name'], type=pa.string())).to_numpy()
+    columns = {name: column[order] for name, column in columns.items()}
+    name_to_idx = {name: i for i, name in enumerate(columns['name'])}
+
     if not has_status:
-        df_x['status'] = None
-        df_x.loc[~df_x['updated_at'].isnull(), 'status'] = 'empty'
-        df_x.loc[~df_x['last_month'].isnull(), 'status'] = 'valid'
+        columns['status'] = np.where(
+            ~np.isnan(columns['last_month']), 'valid',
+            np.where(~np.isnan(columns['updated_at']), 'empty', None),
+        )
+
+    # Apply the updates uploaded as deltas after the last full deployment, in upload order
+    delta_files = sorted(file for file in repo_files if file.startswith(f'{_DELTA_DIR}/') and file.endswith('.parquet'))
+    delta_rows = 0
+    for delta_file in delta_files:
+        delta_rows += _apply_delta(columns, name_to_idx, pq.read_table(hf_client.hf_hub_download(
+            repo_id=repository,
+            repo_type='dataset',
+            filename=delta_file,
+        )))
+    if delta_files:
+        logging.info(f'{len(delta_files)} delta file(s) applied, {delta_rows:,} row(s) updated.')
 
-    d_records = {item['name']: item for item in df_x.replace(np.nan, None).to_dict('records')}
-    df_x = df_x[
-        df_x['updated_at'].isnull() |
-        (~df_x['updated_at'].isnull() & (df_x['updated_at'] + 30 * 86400 < time.time()))
-        ]
-    logging.info(f'Records to refresh:\n{df_x}')
+    # Packages never fetched, or fetched more than 30 days ago
+    updated_at = columns['updated_at']
+    refresh_names = columns['name'][np.isnan(updated_at) | (updated_at + 30 * 86400 < time.time())]
+    logging.info(f'Records to refresh: {len(refresh_names):,} of {size:,}')
 
     has_update = False
-    last_saved_at = None
-    lock = Lock()
-
-    def _generate_charts(df_non_empty, upload_dir):
+    dirty_rows = set()  # indices of the packages updated since the last deployment
+    # Packages updated since the last full deployment, the applied deltas are compacted by the next one
+    dirty_count = delta_rows
+    next_deploy_at = time.monotonic()
+    lock = Lock()  # serializes the deployments
+    state_lock = Lock()  # guards the column writes, dirty rows and counters, held only for short bookkeeping
+    dist_figure = None  # (fig, axes) of the distribution chart, reused by every deployment
+    top_chart = None  # (top-20 rows, png bytes) of the last rendered top packages chart
+    top_table = None  # (top-20 rows, markdown) of the last rendered top packages table
+
+    def _generate_charts(df_non_empty, top_packages, upload_dir):
         """Generate distribution charts for download statistics"""
+        nonlocal dist_figure, top_chart
         plt.style.use('default')
         plt.rcParams['figure.facecolor'] = 'white'
 
-        # Set up the figure with subplots
-        fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+        # Set up the figure with subplots, or clear the one of the previous deployment
+        if dist_figure is None:
+            dist_figure = plt.subplots(2, 3, figsize=(18, 12))
+        else:
+            for ax in dist_figure[1].flat:
+                ax.clear()
+        fig, axes = dist_figure
         fig.suptitle('PyPI Package Download Distribution Analysis', fontsize=16, fontweight='bold')
 
         periods = ['last_day', 'last_week', 'last_month']
@@ -133,17 +305,20 @@ def sync(repository: str, proxy_pool: Optional[str] = None, deploy_span: float =
 
             # Log-scale histogram (top row)
             ax_hist = axes[0, i]
-            log_data = np.log10(data)
-            ax_hist.hist(log_data, bins=50, alpha=0.7, color=color, edgecolor='black', linewidth=0.5)
+            # Bin with numpy over regular bins, and draw the counts as bars
+            log_data = np.log10(data.to_numpy(dtype=np.float64))
+            counts, edges = np.histogram(log_data, bins=50, range=(log_data.min(), log_data.max()))
+            ax_hist.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                        alpha=0.7, color=color, edgecolor='black', linewidth=0.5)
             ax_hist.set_xlabel('Log₁₀(Downloads)')
             ax_hist.set_ylabel('Number of Packages')
             ax_hist.set_title(f'{label} Distribution (Log Scale)')
             ax_hist.grid(True, alpha=0.3)
 
             # Add percentile annotations
+            # All the percentiles are taken from a single partition of the data
             percentiles = [50, 90, 95, 99]
-            for p in percentiles:
-                pct_val = np.percentile(data, p)
+            for p, pct_val in zip(percentiles, np.percentile(data.to_numpy(dtype=np.float64), percentiles)):
                 ax_hist.axvline(np.log10(pct_val), color='red', linestyle='--', alpha=0.7)
                 ax_hist.text(np.log10(pct_val), ax_hist.get_ylim()[1] * 0.8,
                              f'P{p}\n{pct_val:,.0f}',
@@ -166,17 +341,21 @@ def sync(repository: str, proxy_pool: Optional[str] = None, deploy_span: float =
                         verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
                         fontsize=9)
 
-        plt.tight_layout()
+        fig.tight_layout()
         chart_path = os.path.join(upload_dir, 'download_distribution.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.savefig(chart_path, dpi=150, bbox_inches='tight', facecolor='white')
+
+        top_rows = list(top_packages[['name', 'last_day', 'last_week', 'last_month']].itertuples(index=False, name=None))
+        top_packages_path = os.path.join(upload_dir, 'top_packages.png')
+        if top_chart is not None and top_chart[0] == top_rows:
+            # The top packages have not changed, reuse the last rendered chart
+            with open(top_packages_path, 'wb') as f:
+                f.write(top_chart[1])
+            return ['download_distribution.png', 'top_packages.png']
 
         # Generate a separate chart for top packages comparison
         fig, ax = plt.subplots(1, 1, figsize=(14, 10))
 
-        # Get top 20 packages by monthly downloads
-        top_packages = df_non_empty.nlargest(20, 'last_month')
-
         x = np.arange(len(top_packages))
         width = 0.25
 
@@ -200,221 +379,272 @@ def sync(repository: str, proxy_pool: Optional[str] = None, deploy_span: float =
                     f'{height:,.0f}',
                     ha='center', va='bottom', fontsize=8, rotation=90)
 
-        plt.tight_layout()
-        top_packages_path = os.path.join(upload_dir, 'top_packages.png')
-        plt.savefig(top_packages_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(top_packages_path, dpi=150, bbox_inches='tight', facecolor='white')
+        plt.close(fig)
+        with open(top_packages_path, 'rb') as f:
+            top_chart = (top_rows, f.read())
 
         return ['download_distribution.png', 'top_packages.png']
 
     def _deploy(force=False):
-        nonlocal has_update, last_saved_at
-        if not has_update:
+        nonlocal has_update, dirty_rows, dirty_count, next_deploy_at, top_table
+        if not force and time.monotonic() < next_deploy_at:
             return
-        if not force and last_saved_at is not None and last_saved_at + deploy_span > time.time():
-            return
-
-        with TemporaryDirectory() as upload_dir:
-            dst_parquet_file = os.path.join(upload_dir, 'dataset.parquet')
-            logging.info(f'Saving to {dst_parquet_file}')
-            df = pd.DataFrame(list(d_records.values()))
-            df = df.sort_values(by=['name'], ascending=[True])
-            df.to_parquet(dst_parquet_file, index=False)
-
-            # Dataset overview
-            total_rows = len(df)
-            df_notna = df[df['updated_at'].notna()]
-            with_data_rows = len(df_notna)
-            df_non_empty = df_notna[df_notna['status'] == 'valid']
-            for col in ['last_day', 'last_week', 'last_month']:
-                df_non_empty[col] = pd.to_numeric(df_non_empty[col], errors='coerce').astype('Int64')
-            non_empty_rows = len(df_non_empty)
-
-            # Generate charts
-            chart_files = []
-            if non_empty_rows > 0:
-                logging.info('Generating distribution charts...')
-                chart_files = _generate_charts(df_non_empty, upload_dir)
-
-            with open(os.path.join(upload_dir, 'README.md'), 'w') as f:
-                print('---', file=f)
-                print('license: apache-2.0', file=f)
-                print('language:', file=f)
-                print('- en', file=f)
-                print('tags:', file=f)
-                print('- python', file=f)
-                print('- code', file=f)
-                print('- downloads', file=f)
-                print('- pypistats', file=f)
-                print('- tabular', file=f)
-                print('- parquet', file=f)
-                print('- pandas', file=f)
-                print('size_categories:', file=f)
-                print(f'- {number_to_tag(len(df))}', file=f)
-                print('source_datasets:', file=f)
-                print('- pypistats', file=f)
-                print('---', file=f)
-                print('', file=f)
-
-                # Description
-                print('# PyPI Download Statistics Dataset', file=f)
-                print('', file=f)
-                print('This dataset contains download statistics for Python packages from PyPI (Python Package Index). '
-                      'The data is collected from pypistats and includes recent download counts for packages, '
-                      'providing insights into package popularity and usage trends.', file=f)
-                print('', file=f)
-
-                print('## Dataset Overview', file=f)
-                print('', file=f)
-                print(f'- **Total packages**: {total_rows:,}', file=f)
-                print(f'- **Packages with data**: {with_data_rows:,} ({with_data_rows / total_rows * 100:.1f}%)',
-                      file=f)
-                print(f'- **Non-empty packages**: {non_empty_rows:,} ({non_empty_rows / total_rows * 100:.1f}%)',
-                      file=f)
-                print('', file=f)
-
-                # Schema description
-                print('## Schema', file=f)
-                print('', file=f)
-                print('| Column | Type | Description |', file=f)
-                print('|--------|------|-------------|', file=f)
-                print('| name | string | Package name on PyPI |', file=f)
-                print('| url | string | PyPI package URL |', file=f)
-                print('| last_day | integer | Downloads in the last day |', file=f)
-                print('| last_week | integer | Downloads in the last week |', file=f)
-                print('| last_month | integer | Downloads in the last month |', file=f)
-                print('| status | string | Whether the package has no download data (null, empty, valid) |', file=f)
-                print('| updated_at | float | Unix timestamp of last update |', file=f)
-                print('', file=f)
-
-                # Distribution Analysis Charts
-                if chart_files and non_empty_rows > 0:
-                    print('## Download Distribution Analysis', file=f)
-                    print('', file=f)
-                    print('The following charts show the distribution of download statistics across all PyPI packages. '
-                          'As expected, the data exhibits a long-tail distribution where a small number of packages '
-                          'receive the majority of downloads.', file=f)
-                    print('', file=f)
-
-                    if 'download_distribution.png' in chart_files:
-                        print('### Distribution Overview', file=f)
-                        print('', file=f)
-                        print('![Download Distribution](download_distribution.png)', file=f)
-                        print('', file=f)
-                        print('**Top row**: Histogram showing the distribution of downloads on a logarithmic scale. '
-                              'The red dashed lines indicate key percentiles (P50, P90, P95, P99).', file=f)
-                        print('', file=f)
-                        print('**Bottom row**: Cumulative distribution showing what percentage of packages '
-                              'have downloads below a given threshold.', file=f)
-                        print('', file=f)
-
-                    if 'top_packages.png' in chart_files:
-                        print('### Top Packages Comparison', file=f)
-                        print('', file=f)
-                        print('![Top Packages](top_packages.png)', file=f)
-                        print('', file=f)
-                        print(
-                            'Comparison of daily, weekly, and monthly download volumes for the top 20 most downloaded packages.',
-                            file=f)
-                        print('', file=f)
-
-                # Sample data
-                print('## Sample Data', file=f)
-                print('', file=f)
-                sample_df = df_non_empty.head(20)[['name', 'last_day', 'last_week', 'last_month', 'status']]
-                print('First 20 packages:', file=f)
-                print('', file=f)
-                print(sample_df.to_markdown(index=False), file=f)
-                print('', file=f)
-
-                # Top packages by downloads
-                if non_empty_rows > 0:
-                    top_df = df_non_empty.nlargest(20, 'last_month')[
-                        ['name', 'last_day', 'last_week', 'last_month']]
-                    print('## Top 20 Packages by Monthly Downloads', file=f)
-                    print('', file=f)
-                    print(top_df.to_markdown(index=False), file=f)
-                    print('', file=f)
-
-                    # Statistics
-                    stats_df = df_non_empty
-                    if len(stats_df) > 0:
-                        print('## Download Statistics', file=f)
-                        print('', file=f)
-                        print('### Monthly Downloads', file=f)
-                        print(f'- **Total**: {stats_df["last_month"].sum():,}', file=f)
-                        print(f'- **Average**: {stats_df["last_month"].mean():.0f}', file=f)
-                        print(f'- **Median**: {stats_df["last_month"].median():.0f}', file=f)
-                        print(f'- **Max**: {stats_df["last_month"].max():,}', file=f)
-                        print('', file=f)
-
-                        print('### Weekly Downloads', file=f)
-                        print(f'- **Total**: {stats_df["last_week"].sum():,}', file=f)
-                        print(f'- **Average**: {stats_df["last_week"].mean():.0f}', file=f)
-                        print(f'- **Median**: {stats_df["last_week"].median():.0f}', file=f)
-                        print(f'- **Max**: {stats_df["last_week"].max():,}', file=f)
-                        print('', file=f)
-
-                        print('### Daily Downloads', file=f)
-                        print(f'- **Total**: {stats_df["last_day"].sum():,}', file=f)
-                        print(f'- **Average**: {stats_df["last_day"].mean():.0f}', file=f)
-                        print(f'- **Median**: {stats_df["last_day"].median():.0f}', file=f)
-                        print(f'- **Max**: {stats_df["last_day"].max():,}', file=f)
-                        print('', file=f)
-
-            upload_directory_as_directory(
-                repo_id=repository,
-                repo_type='dataset',
-                local_directory=upload_dir,
-                path_in_repo='.',
-                message=f'Update PyPI - {total_rows:,} packages, '
-                        f'{with_data_rows:,} ({with_data_rows / total_rows * 100:.1f}%) with data, '
-                        f'{non_empty_rows:,} ({non_empty_rows / total_rows * 100:.1f}%) non empty',
-                clear=True,
-            )
-
-        has_update = False
-        last_saved_at = time.time()
+        with state_lock:
+            # The final forced deployment also runs for the updates only uploaded as deltas so far
+            if not has_update and not (force and dirty_count > 0):
+                return
+
+            # The full dataset, charts and README are only deployed when enough packages changed,
+            # the other deployments just upload the updated packages as a delta file
+            count = dirty_count
+            full = force or count >= full_deploy_threshold
+
+            # Clear the flags with the snapshot, so that updates made during the deployment raise them again
+            has_update = False
+            rows, dirty_rows = dirty_rows, set()
+            # Copy the columns, the arrays are written on by the workers while the snapshot is serialized,
+            # and the delta only takes the packages updated since the last deployment
+            if full:
+                snapshot = {name: column.copy() for name, column in columns.items()}
+            else:
+                indices = np.fromiter(sorted(rows), dtype=np.intp, count=len(rows))
+                snapshot = {name: column[indices] for name, column in columns.items()}
+        try:
+            with TemporaryDirectory() as upload_dir:
+                if not full:
+                    # Applied to the dataset by the next sync
+                    delta_file = os.path.join(upload_dir, _DELTA_DIR, f'{time.time_ns():020d}.parquet')
+                    os.makedirs(os.path.dirname(delta_file))
+                    logging.info(f'Saving {len(rows):,} updated package(s) to {delta_file}')
+                    pq.write_table(_build_table(snapshot), delta_file, compression='zstd')
+                    upload_directory_as_directory(
+                        repo_id=repository,
+                        repo_type='dataset',
+                        local_directory=upload_dir,
+                        path_in_repo='.',
+                        message=f'Update PyPI - {len(rows):,} packages updated',
+                        clear=False,
+                    )
+                else:
+                    dst_parquet_file = os.path.join(upload_dir, 'dataset.parquet')
+                    logging.info(f'Saving to {dst_parquet_file}, {len(rows):,} package(s) updated since the last deployment')
+                    table = _build_table(snapshot)
+                    _write_bucketed_parquet(table, dst_parquet_file)
+                    # Dataset overview, counted and filtered in Arrow, only the non-empty packages are
+                    # converted to pandas for the charts and README, without their URLs
+                    total_rows = table.num_rows
+                    with_data_rows = total_rows - table['updated_at'].null_count
+                    non_empty = pc.and_(pc.is_valid(table['updated_at']), pc.equal(table['status'], 'valid'))
+                    df_non_empty = table.filter(non_empty).drop_columns(['url']) \
+                        .to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+                    non_empty_rows = len(df_non_empty)
+                    # Top 20 packages by monthly downloads, shared by the chart and the README
+                    top_packages = nlargest(df_non_empty, 'last_month', 20)
+
+                    # Generate charts
+                    chart_files = []
+                    if non_empty_rows > 0:
+                        logging.info('Generating distribution charts...')
+                        chart_files = _generate_charts(df_non_empty, top_packages, upload_dir)
+
+                    lines = []
+                    lines.append('---')
+                    lines.append('license: apache-2.0')
+                    lines.append('language:')
+                    lines.append('- en')
+                    lines.append('tags:')
+                    lines.append('- python')
+                    lines.append('- code')
+                    lines.append('- downloads')
+                    lines.append('- pypistats')
+                    lines.append('- tabular')
+                    lines.append('- parquet')
+                    lines.append('- pandas')
+                    lines.append('size_categories:')
+                    lines.append(f'- {number_to_tag(total_rows)}')
+                    lines.append('source_datasets:')
+                    lines.append('- pypistats')
+                    lines.append('---')
+                    lines.append('')
+
+                    # Description
+                    lines.append('# PyPI Download Statistics Dataset')
+                    lines.append('')
+                    lines.append('This dataset contains download statistics for Python packages from PyPI (Python Package Index). '
+                                 'The data is collected from pypistats and includes recent download counts for packages, '
+                                 'providing insights into package popularity and usage trends.')
+                    lines.append('')
+
+                    lines.append('## Dataset Overview')
+                    lines.append('')
+                    lines.append(f'- **Total packages**: {total_rows:,}')
+                    lines.append(f'- **Packages with data**: {with_data_rows:,} ({with_data_rows / total_rows * 100:.1f}%)')
+                    lines.append(f'- **Non-empty packages**: {non_empty_rows:,} ({non_empty_rows / total_rows * 100:.1f}%)')
+                    lines.append('')
+
+                    # Schema description
+                    lines.append('## Schema')
+                    lines.append('')
+                    lines.append('| Column | Type | Description |')
+                    lines.append('|--------|------|-------------|')
+                    lines.append('| name | string | Package name on PyPI |')
+                    lines.append('| url | string | PyPI package URL |')
+                    lines.append('| last_day | integer | Downloads in the last day |')
+                    lines.append('| last_week | integer | Downloads in the last week |')
+                    lines.append('| last_month | integer | Downloads in the last month |')
+                    lines.append('| status | string | Whether the package has no download data (null, empty, valid) |')
+                    lines.append('| updated_at | float | Unix timestamp of last update |')
+                    lines.append('')
+
+                    # Distribution Analysis Charts
+                    if chart_files and non_empty_rows > 0:
+                        lines.append('## Download Distribution Analysis')
+                        lines.append('')
+                        lines.append('The following charts show the distribution of download statistics across all PyPI packages. '
+                                     'As expected, the data exhibits a long-tail distribution where a small number of packages '
+                                     'receive the majority of downloads.')
+                        lines.append('')
+
+                        if 'download_distribution.png' in chart_files:
+                            lines.append('### Distribution Overview')
+                            lines.append('')
+                            lines.append('![Download Distribution](download_distribution.png)')
+                            lines.append('')
+                            lines.append('**Top row**: Histogram showing the distribution of downloads on a logarithmic scale. '
+                                         'The red dashed lines indicate key percentiles (P50, P90, P95, P99).')
+                            lines.append('')
+                            lines.append('**Bottom row**: Cumulative distribution showing what percentage of packages '
+                                         'have downloads below a given threshold.')
+                            lines.append('')
+
+                        if 'top_packages.png' in chart_files:
+                            lines.append('### Top Packages Comparison')
+                            lines.append('')
+                            lines.append('![Top Packages](top_packages.png)')
+                            lines.append('')
+                            lines.append(
+                                'Comparison of daily, weekly, and monthly download volumes for the top 20 most downloaded packages.')
+                            lines.append('')
+
+                    # Sample data
+                    lines.append('## Sample Data')
+                    lines.append('')
+                    sample_df = df_non_empty.head(20)[['name', 'last_day', 'last_week', 'last_month', 'status']]
+                    lines.append('First 20 packages:')
+                    lines.append('')
+                    lines.append(to_markdown(sample_df))
+                    lines.append('')
+
+                    # Top packages by downloads
+                    if non_empty_rows > 0:
+                        top_df = top_packages[['name', 'last_day', 'last_week', 'last_month']]
+                        top_rows = list(top_df.itertuples(index=False, name=None))
+                        if top_table is None or top_table[0] != top_rows:
+                            top_table = (top_rows, to_markdown(top_df))
+                        lines.append('## Top 20 Packages by Monthly Downloads')
+                        lines.append('')
+                        lines.append(top_table[1])
+                        lines.append('')
+
+                        # Statistics
+                        stats_df = df_non_empty
+                        if len(stats_df) > 0:
+                            lines.append('## Download Statistics')
+                            lines.append('')
+                            for col, title in [('last_month', 'Monthly'), ('last_week', 'Weekly'),
+                                               ('last_day', 'Daily')]:
+                                # Reduce plain integer arrays, the mean is derived from the sum
+                                values = stats_df[col].dropna().to_numpy(dtype=np.int64)
+                                if len(values) == 0:
+                                    continue
+                                total = values.sum()
+                                lines.append(f'### {title} Downloads')
+                                lines.append(f'- **Total**: {total:,}')
+                                lines.append(f'- **Average**: {total / len(values):.0f}')
+                                lines.append(f'- **Median**: {np.median(values):.0f}')
+                                lines.append(f'- **Max**: {values.max():,}')
+                                lines.append('')
+
+                    with open(os.path.join(upload_dir, 'README.md'), 'w') as f:
+                        f.write('\n'.join(lines) + '\n')
+
+                    upload_directory_as_directory(
+                        repo_id=repository,
+                        repo_type='dataset',
+                        local_directory=upload_dir,
+                        path_in_repo='.',
+                        message=f'Update PyPI - {total_rows:,} packages, '
+                                f'{with_data_rows:,} ({with_data_rows / total_rows * 100:.1f}%) with data, '
+                                f'{non_empty_rows:,} ({non_empty_rows / total_rows * 100:.1f}%) non empty',
+                        clear=True,
+                    )
+        except BaseException:
+            with state_lock:
+                has_update = True
+                dirty_rows |= rows
+            raise
+
+        next_deploy_at = time.monotonic() + deploy_span
+        if full:
+            with state_lock:
+                # The packages updated during this deployment are counted for the next one
+                dirty_count -= count
 
     def _make_item(pypi_name: str):
-        nonlocal has_update
+        nonlocal has_update, dirty_count
         updated_at = time.time()
         data = get_pypistats_recent(pypi_name, session=session)
+        i = name_to_idx[pypi_name]
         if not data:
             logging.warning(f'No data found for {pypi_name!r}, skipped.')
-            d_records[pypi_name]['last_day'] = None
-            d_records[pypi_name]['last_week'] = None
-            d_records[pypi_name]['last_month'] = None
-            d_records[pypi_name]['status'] = 'empty'
-        else:
-            d_records[pypi_name]['last_day'] = data['data']['last_day']
-            d_records[pypi_name]['last_week'] = data['data']['last_week']
-            d_records[pypi_name]['last_month'] = data['data']['last_month']
-            d_records[pypi_name]['status'] = 'valid'
-        d_records[pypi_name]['updated_at'] = updated_at
-
-        with lock:
+        # The row is written together with its dirty mark, so a snapshot never sees it half updated
+        with state_lock:
+            if not data:
+                columns['last_day'][i] = np.nan
+                columns['last_week'][i] = np.nan
+                columns['last_month'][i] = np.nan
+                columns['status'][i] = 'empty'
+            else:
+                columns['last_day'][i] = data['data']['last_day']
+                columns['last_week'][i] = data['data']['last_week']
+                columns['last_month'][i] = data['data']['last_month']
+                columns['status'][i] = 'valid'
+            columns['updated_at'][i] = updated_at
             has_update = True
-            _deploy(force=False)
+            dirty_rows.add(i)
+            dirty_count += 1
+        # Only the items finished after the deadline contend for the lock, the others return right away
+        if time.monotonic() >= next_deploy_at:
+            with lock:
+                _deploy(force=False)
 
     parallel_call(
-        iterable=natsorted(df_x['name']),
+        iterable=refresh_names,
         fn=_make_item,
-        desc='Getting data'
+        desc='Getting data',
+        max_workers=max_workers,
     )
 
     _deploy(force=True)
 
 
 if __name__ == '__main__':
-    # Set up colored logging
+    # Set up colored logging, the workers only enqueue their records and one thread formats and writes them
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(ColoredFormatter())
-    logger.addHandler(console_handler)
-
-    sync(
-        repository='HansBug/pypi_downloads',
-        proxy_pool=os.environ['PP_URL']
-    )
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, console_handler)
+    log_listener.start()
+
+    try:
+        sync(
+            repository='HansBug/pypi_downloads',
+            proxy_pool=os.environ['PP_URL']
+        )
+    finally:
+        log_listener.stop()
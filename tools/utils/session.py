@@ -60,7 +60,7 @@ class TimeoutHTTPAdapter(HTTPAdapter):
 
 def get_requests_session(max_retries: int = 5, timeout: int = DEFAULT_TIMEOUT, verify: bool = True,
                          headers: Optional[Dict[str, str]] = None, extra_retry_status_code: Optional[List[int]] = None,
-                         session: Optional[requests.Session] = None) \
+                         session: Optional[requests.Session] = None, pool_size: int = 32) \
         -> requests.Session:
     """
     Returns a requests Session object configured with retry and timeout settings.
@@ -73,6 +73,9 @@ def get_requests_session(max_retries: int = 5, timeout: int = DEFAULT_TIMEOUT, v
     :type headers: Optional[Dict[str, str]]
     :param session: An existing requests Session object to use. If not provided, a new Session object is created. (default: None)
     :type session: Optional[requests.Session]
+    :param pool_size: The number of connections kept alive per host, should be no less than the number of threads
+        sharing the session. (default: 32)
+    :type pool_size: int
     :returns: The requests Session object.
     :rtype: requests.Session
     """
@@ -86,7 +89,8 @@ def get_requests_session(max_retries: int = 5, timeout: int = DEFAULT_TIMEOUT, v
         status_forcelist=status_forcelist,
         allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS", "TRACE"],
     )
-    adapter = TimeoutHTTPAdapter(max_retries=retries, timeout=timeout, pool_connections=32, pool_maxsize=32)
+    adapter = TimeoutHTTPAdapter(max_retries=retries, timeout=timeout, pool_connections=pool_size,
+                                 pool_maxsize=pool_size)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
     session.headers.update({